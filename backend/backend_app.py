@@ -1,13 +1,21 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
-import pandas as pd
 import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import wraps
 from werkzeug.utils import secure_filename
-from ml_models import FraudDetectionModel
-from data_processor import DataProcessor
 import json
 from datetime import datetime
 import io
+import time
+
+# pandas, numpy and the model stack are imported by load_libraries() so the server starts
+# answering health checks before they are loaded
+pd = np = None
+FraudDetectionModel = DecisionPolicy = DataProcessor = ResultFormatter = None
+MODEL_INPUT_COLUMNS = FORMAT_MIMETYPES = FORMAT_EXTENSIONS = None
 
 app = Flask(__name__)
 CORS(app)
@@ -16,6 +24,19 @@ CORS(app)
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'csv'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MEMORY_BUDGET = os.environ.get('FRAUD_MEMORY_BUDGET', '').lower() in ('1', 'true', 'yes')
+MAX_MEMORY_MB = float(os.environ['FRAUD_MAX_MEMORY_MB']) if os.environ.get('FRAUD_MAX_MEMORY_MB') else None
+CASCADE = os.environ.get('FRAUD_CASCADE', '').lower() in ('1', 'true', 'yes')
+CASCADE_RECALL_FLOOR = float(os.environ.get('FRAUD_CASCADE_RECALL_FLOOR', 0.95))
+# Screening band: unset low is calibrated to the recall floor; high < 1 lets the screen flag fraud itself
+CASCADE_LOW = float(os.environ['FRAUD_CASCADE_LOW']) if os.environ.get('FRAUD_CASCADE_LOW') else None
+CASCADE_HIGH = float(os.environ.get('FRAUD_CASCADE_HIGH', 1.0))
+REASON_THRESHOLD = float(os.environ.get('FRAUD_REASON_THRESHOLD', 0.5))
+GRAPH_FEATURES = os.environ.get('FRAUD_GRAPH_FEATURES', '').lower() in ('1', 'true', 'yes')
+RUN_CACHE_SIZE = 3  # prediction runs whose feature matrices are kept for on-request explanations
+AUTOLOAD_MODEL = os.environ.get('FRAUD_AUTOLOAD_MODEL', 'true').lower() in ('1', 'true', 'yes')
+WARMUP_ROWS = int(os.environ.get('FRAUD_WARMUP_ROWS', 256))  # 0 disables the warm-up batch
+STARTUP_WAIT_SECONDS = 120  # how long requests wait for a startup still in progress
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs('models', exist_ok=True)
@@ -23,19 +44,188 @@ os.makedirs('models', exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
-# Global model instance
-fraud_model = FraudDetectionModel()
-processor = DataProcessor()
+# Global model instance, created by the background startup
+fraud_model = None
+processor = None
+run_features = OrderedDict()
+run_scores = OrderedDict()
+
+libraries_lock = threading.Lock()
+startup_lock = threading.Lock()
+startup_done = threading.Event()
+startup_thread = None
+startup_state = {
+    'status': 'starting',
+    'started_at': datetime.now().isoformat(),
+    'ready_at': None,
+    'model_path': None,
+    'error': None,
+    'timings': {}
+}
+
+def load_libraries():
+    """Import the data and model stack on first use"""
+    global pd, np, FraudDetectionModel, DecisionPolicy, DataProcessor, ResultFormatter
+    global MODEL_INPUT_COLUMNS, FORMAT_MIMETYPES, FORMAT_EXTENSIONS, processor
+    with libraries_lock:
+        if processor is not None:
+            return
+        import pandas as pd
+        import numpy as np
+        from ml_models import FraudDetectionModel
+        from decision_policy import DecisionPolicy
+        from data_processor import DataProcessor, MODEL_INPUT_COLUMNS
+        from result_formats import ResultFormatter, FORMAT_MIMETYPES, FORMAT_EXTENSIONS
+        processor = DataProcessor()
+
+def create_model():
+    return FraudDetectionModel(
+        memory_budget=MEMORY_BUDGET,
+        max_memory_mb=MAX_MEMORY_MB,
+        cascade=CASCADE,
+        cascade_band=(CASCADE_LOW, CASCADE_HIGH),
+        recall_floor=CASCADE_RECALL_FLOOR,
+        reason_threshold=REASON_THRESHOLD,
+        graph_features=GRAPH_FEATURES
+    )
+
+def latest_saved_model():
+    """Most recently saved model directory ('models' or a named version), if any"""
+    candidates = ['models'] + [os.path.join('models', name) for name in os.listdir('models')]
+    saved = [path for path in candidates if os.path.exists(os.path.join(path, 'rf_model.pkl'))]
+    if not saved:
+        return None
+    return max(saved, key=lambda path: os.path.getmtime(os.path.join(path, 'rf_model.pkl')))
+
+def run_startup():
+    """Import libraries, load the last saved model and warm it with a synthetic batch"""
+    global fraud_model
+    timings = startup_state['timings']
+    try:
+        started = time.perf_counter()
+        load_libraries()
+        timings['import_seconds'] = round(time.perf_counter() - started, 2)
+        
+        model = create_model()
+        path = latest_saved_model() if AUTOLOAD_MODEL else None
+        if path:
+            startup_state['status'] = 'loading'
+            started = time.perf_counter()
+            saved_model = create_model()
+            saved_model.load(path)
+            timings['load_seconds'] = round(time.perf_counter() - started, 2)
+            if saved_model.rf_model is not None and saved_model.xgb_model is not None \
+                    and saved_model.isolation_forest is not None and saved_model.feature_names is not None:
+                model = saved_model
+                startup_state['model_path'] = path
+                if WARMUP_ROWS > 0:
+                    startup_state['status'] = 'warming'
+                    started = time.perf_counter()
+                    model.warm_up(DataProcessor.generate_sample_data(WARMUP_ROWS))
+                    timings['warm_up_seconds'] = round(time.perf_counter() - started, 2)
+            else:
+                startup_state['error'] = f'Could not load saved model from {path}'
+        fraud_model = model
+        startup_state['status'] = 'ready'
+        startup_state['ready_at'] = datetime.now().isoformat()
+        print(f"Startup complete: {startup_state}")
+    except Exception as e:
+        startup_state['status'] = 'failed'
+        startup_state['error'] = str(e)
+        print(f"Startup failed: {str(e)}")
+    finally:
+        startup_done.set()
+
+def start_background_startup():
+    """Run the startup sequence once, in a background thread"""
+    global startup_thread
+    with startup_lock:
+        if startup_thread is None:
+            startup_thread = threading.Thread(target=run_startup, name='startup', daemon=True)
+            startup_thread.start()
+
+def requires_startup(endpoint):
+    """Hold a request until the libraries and model are ready"""
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        start_background_startup()
+        if not startup_done.wait(STARTUP_WAIT_SECONDS):
+            return jsonify({'success': False, 'error': 'Server is still starting up'}), 503
+        if fraud_model is None:
+            return jsonify({'success': False, 'error': f"Startup failed: {startup_state['error']}"}), 503
+        return endpoint(*args, **kwargs)
+    return wrapper
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def cache_run_features(results_filepath):
+    """Keep the feature matrices of the latest runs for on-request explanations"""
+    run_features[os.path.basename(results_filepath)] = fraud_model.last_features
+    while len(run_features) > RUN_CACHE_SIZE:
+        run_features.popitem(last=False)
+
+def run_scores_path(run_name):
+    return os.path.join(UPLOAD_FOLDER, f'{os.path.splitext(run_name)[0]}.scores.npz')
+
+def store_run_scores(results_filepath, results_df):
+    """Keep the raw per-model scores of a run so it can be re-decided without re-scoring"""
+    run_name = os.path.basename(results_filepath)
+    scores = DecisionPolicy.extract_scores(results_df)
+    DecisionPolicy.save_scores(scores, run_scores_path(run_name))
+    run_scores[run_name] = scores
+    while len(run_scores) > RUN_CACHE_SIZE:
+        run_scores.popitem(last=False)
+
+def load_run_scores(run_name):
+    """Scores of a run from memory, falling back to the file stored with it"""
+    if run_name not in run_scores:
+        path = run_scores_path(run_name)
+        if not os.path.exists(path):
+            return None
+        run_scores[run_name] = DecisionPolicy.load_scores(path)
+        while len(run_scores) > RUN_CACHE_SIZE:
+            run_scores.popitem(last=False)
+    run_scores.move_to_end(run_name)
+    return run_scores[run_name]
+
+def stream_response(chunks, result_format, download_name=None):
+    """Stream serialized results with the negotiated compression"""
+    encoding = ResultFormatter.negotiate_encoding(request.accept_encodings, result_format)
+    response = Response(ResultFormatter.compress(chunks, encoding), mimetype=FORMAT_MIMETYPES[result_format])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    if download_name:
+        response.headers['Content-Disposition'] = f'attachment; filename={download_name}'
+    return response
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    return jsonify({
+        'status': 'healthy',
+        'ready': startup_state['status'] == 'ready',
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/health/live', methods=['GET'])
+def liveness():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'alive', 'timestamp': datetime.now().isoformat()})
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness():
+    """Readiness: libraries imported and the saved model loaded and warmed"""
+    ready = startup_state['status'] == 'ready'
+    return jsonify({
+        'ready': ready,
+        'model_loaded': startup_state['model_path'] is not None,
+        **startup_state
+    }), 200 if ready else 503
 
 @app.route('/api/sample-data', methods=['GET'])
+@requires_startup
 def get_sample_data():
     """Generate and return sample data"""
     try:
@@ -66,6 +256,7 @@ def get_sample_data():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/validate-csv', methods=['POST'])
+@requires_startup
 def validate_csv():
     """Validate uploaded CSV"""
     try:
@@ -80,39 +271,40 @@ def validate_csv():
         if not allowed_file(file.filename):
             return jsonify({'success': False, 'error': 'Only CSV files allowed'}), 400
         
-        # Read file content
-        content = file.read()
-        
-        # Check if file is empty
-        if len(content) == 0:
-            return jsonify({'success': False, 'error': 'File is empty'}), 400
-        
-        # Decode content
+        # Stream the upload to a temporary file; it only takes the real name once it is valid,
+        # so a bad re-upload never replaces a file that was already validated
+        filename = secure_filename(file.filename or 'uploaded_file.csv')
+        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        fd, temp_path = tempfile.mkstemp(dir=UPLOAD_FOLDER, prefix='.upload-', suffix='.part')
         try:
-            decoded_content = content.decode('utf-8')
-        except UnicodeDecodeError:
-            return jsonify({'success': False, 'error': 'File encoding not supported. Please use UTF-8 encoded CSV files.'}), 400
-        
-        validation_result = processor.validate_csv(decoded_content)
-        
-        if validation_result['success']:
-            # Save file
-            filename = secure_filename(file.filename or 'uploaded_file.csv')
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
+            with os.fdopen(fd, 'wb') as f:
+                file.save(f)
             
-            # Write file to disk
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(decoded_content)
+            # Check if file is empty
+            if os.path.getsize(temp_path) == 0:
+                return jsonify({'success': False, 'error': 'File is empty'}), 400
             
-            validation_result['filepath'] = filepath
-        
-        return jsonify(validation_result)
+            if not processor.is_utf8(temp_path):
+                return jsonify({'success': False, 'error': 'File encoding not supported. Please use UTF-8 encoded CSV files.'}), 400
+            
+            # Only the header and a few sample rows are parsed here
+            validation_result = processor.validate_csv_file(temp_path)
+            
+            if validation_result['success']:
+                os.replace(temp_path, filepath)
+                validation_result['filepath'] = filepath
+            
+            return jsonify(validation_result)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
     
     except Exception as e:
         print(f"Upload error: {str(e)}")
         return jsonify({'success': False, 'error': f'Upload failed: {str(e)}'}), 500
 
 @app.route('/api/train', methods=['POST'])
+@requires_startup
 def train_model():
     """Train fraud detection model"""
     try:
@@ -123,14 +315,15 @@ def train_model():
         if not filepath or not os.path.exists(filepath):
             return jsonify({'success': False, 'error': 'Invalid filepath'}), 400
         
-        # Load data
-        df = pd.read_csv(filepath)
+        # Load only the columns the models use
+        df = processor.read_transactions(filepath, usecols=MODEL_INPUT_COLUMNS + [fraud_column])
         
         print(f"Training with {len(df)} samples...")
         training_stats = fraud_model.train(df, fraud_column)
         
         # Save model
         fraud_model.save('models')
+        run_features.clear()
         
         return jsonify({
             'success': True,
@@ -142,6 +335,7 @@ def train_model():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/predict', methods=['POST'])
+@requires_startup
 def predict():
     """Predict fraud on new transactions"""
     try:
@@ -167,7 +361,7 @@ def predict():
             return jsonify({'success': False, 'error': 'No file or filepath provided'}), 400
         
         # Load data
-        df = pd.read_csv(filepath)
+        df = processor.read_transactions(filepath)
         
         print(f"Predicting on {len(df)} transactions...")
         results_df = fraud_model.predict(df)
@@ -190,28 +384,59 @@ def predict():
         
         stats = processor.get_statistics(results_df)
         
-        # Prepare response
-        results_for_json = results_df.copy()
+        # Save results
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        results_filepath = os.path.join(UPLOAD_FOLDER, f'predictions_{timestamp}.csv')
+        results_df.to_csv(results_filepath, index=False)
+        cache_run_features(results_filepath)
+        store_run_scores(results_filepath, results_df)
+        challengers = fraud_model.challengers
+        if len(challengers):
+            # Challenger scores are recorded next to the results, never returned as decisions
+            challenger_scores = pd.DataFrame({'champion': results_df['ensemble_fraud_probability'].to_numpy()})
+            for name, scores in challengers.last_scores.items():
+                challenger_scores[name] = scores
+            challenger_scores.to_csv(
+                os.path.join(UPLOAD_FOLDER, f'challengers_{timestamp}.csv'), index=False
+            )
+        
+        # Programmatic clients can negotiate the full results in a compact format
+        result_format = ResultFormatter.negotiate_format(
+            request.args.get('format'), request.accept_mimetypes, default='json'
+        )
+        if result_format is None:
+            return jsonify({
+                'success': False,
+                'error': f"Unsupported format. Use one of: {', '.join(ResultFormatter.available_formats())}"
+            }), 406
+        if result_format != 'json':
+            response = stream_response(ResultFormatter.iter_encoded(results_df, result_format), result_format)
+            response.headers['X-Total-Results'] = str(len(results_df))
+            response.headers['X-Results-File'] = results_filepath
+            return response
+        
+        # Prepare response (only the rows that are sent)
+        results_for_json = results_df.head(100).copy()
         
         # Convert to JSON-serializable format
         for col in results_for_json.columns:
-            if results_for_json[col].dtype == 'object':
+            if pd.api.types.is_datetime64_any_dtype(results_for_json[col]):
+                results_for_json[col] = results_for_json[col].astype(str)
+            elif results_for_json[col].dtype == 'object':
                 try:
                     results_for_json[col] = results_for_json[col].astype(str)
                 except:
                     pass
         
-        # Save results
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        results_filepath = os.path.join(UPLOAD_FOLDER, f'predictions_{timestamp}.csv')
-        results_df.to_csv(results_filepath, index=False)
-        
         return jsonify({
             'success': True,
             'statistics': stats,
-            'results': results_for_json.head(100).to_dict(orient='records'),
+            'results': results_for_json.to_dict(orient='records'),
             'total_results': len(results_df),
-            'results_file': results_filepath
+            'results_file': results_filepath,
+            'memory_report': fraud_model.memory_report,
+            'cascade_stats': fraud_model.cascade_stats if fraud_model.cascade else None,
+            'challengers': challengers.summary() if len(challengers) else None
         })
     
     except Exception as e:
@@ -219,6 +444,7 @@ def predict():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/download-results/<filename>', methods=['GET'])
+@requires_startup
 def download_results(filename):
     """Download prediction results"""
     try:
@@ -226,11 +452,158 @@ def download_results(filename):
         if not os.path.exists(filepath):
             return jsonify({'error': 'File not found'}), 404
         
-        return send_file(filepath, as_attachment=True)
+        result_format = ResultFormatter.negotiate_format(
+            request.args.get('format'), request.accept_mimetypes, default='csv'
+        )
+        if result_format is None or result_format == 'json':
+            return jsonify({
+                'error': f"Unsupported format. Use one of: {', '.join(f for f in ResultFormatter.available_formats() if f != 'json')}"
+            }), 406
+        
+        download_name = f"{os.path.splitext(filename)[0]}.{FORMAT_EXTENSIONS[result_format]}"
+        if result_format == 'csv':
+            if ResultFormatter.negotiate_encoding(request.accept_encodings, result_format) is None:
+                return send_file(filepath, as_attachment=True)
+            # Compress the stored file as it is streamed
+            return stream_response(ResultFormatter.iter_file(filepath), result_format, download_name)
+        
+        results_df = processor.read_transactions(filepath)
+        return stream_response(ResultFormatter.iter_encoded(results_df, result_format), result_format, download_name)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/explain', methods=['POST'])
+@requires_startup
+def explain_predictions():
+    """Reason codes for selected rows of a recent prediction run"""
+    try:
+        data = request.get_json() if request.is_json else {}
+        data = data or {}
+        run_name = os.path.basename(str(data.get('results_file') or ''))
+        if run_name not in run_features:
+            return jsonify({'success': False, 'error': 'Run not available for explanation. Please run the prediction again.'}), 404
+        
+        X, X_scaled = run_features[run_name]
+        rows = np.asarray(data.get('rows') or [], dtype=int)
+        if len(rows) == 0:
+            return jsonify({'success': False, 'error': 'No rows requested'}), 400
+        if rows.min() < 0 or rows.max() >= len(X_scaled):
+            return jsonify({'success': False, 'error': f'Rows must be between 0 and {len(X_scaled) - 1}'}), 400
+        
+        top_k = int(data.get('top_k') or fraud_model.reason_top_k)
+        reasons = fraud_model.explain(X_scaled[rows], X.to_numpy()[rows], top_k)
+        return jsonify({
+            'success': True,
+            'results_file': run_name,
+            'reasons': {str(row): row_reasons for row, row_reasons in zip(rows.tolist(), reasons)}
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def parse_entity_id(value):
+    """Graph ids keep the type they were uploaded with: numbers where they parse, else strings"""
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+@app.route('/api/what-if', methods=['POST'])
+@requires_startup
+def what_if():
+    """Re-decide a stored run with a different threshold, risk bands or ensemble weights"""
+    try:
+        data = request.get_json() if request.is_json else {}
+        data = data or {}
+        run_name = os.path.basename(str(data.get('results_file') or ''))
+        scores = load_run_scores(run_name) if run_name else None
+        if scores is None:
+            return jsonify({'success': False, 'error': 'Run not found. Please run the prediction again.'}), 404
+        
+        current = fraud_model.policy
+        try:
+            policy = DecisionPolicy(
+                threshold=data.get('threshold', current.threshold),
+                risk_bands=data.get('risk_bands', current.risk_bands),
+                weights=data.get('weights', current.weights)
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        started = time.perf_counter()
+        decided = policy.evaluate(scores)
+        stats = processor.get_statistics(decided)
+        decisions = decided['is_fraud_predicted'].to_numpy()
+        agreement = decided['agreement_state'].value_counts()
+        return jsonify({
+            'success': True,
+            'policy': policy.to_dict(),
+            'statistics': stats,
+            'agreement': agreement[agreement > 0].to_dict(),
+            'changes': {
+                'newly_flagged': int(((decisions == 1) & (scores['decisions'] == 0)).sum()),
+                'no_longer_flagged': int(((decisions == 0) & (scores['decisions'] == 1)).sum())
+            },
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/graph/summary', methods=['GET'])
+@requires_startup
+def graph_summary():
+    """Size of the customer-merchant graph"""
+    if fraud_model.graph is None:
+        return jsonify({'success': False, 'error': 'Graph features are not enabled'}), 400
+    return jsonify({'success': True, 'graph': fraud_model.graph.summary()})
+
+@app.route('/api/graph/subgraph', methods=['GET'])
+@requires_startup
+def graph_subgraph():
+    """Neighbourhood of a customer or merchant in the transaction graph"""
+    try:
+        if fraud_model.graph is None:
+            return jsonify({'success': False, 'error': 'Graph features are not enabled'}), 400
+        
+        if request.args.get('customer_id') is not None:
+            kind, entity_id = 'customer', request.args['customer_id']
+        elif request.args.get('merchant_id') is not None:
+            kind, entity_id = 'merchant', request.args['merchant_id']
+        else:
+            return jsonify({'success': False, 'error': 'customer_id or merchant_id is required'}), 400
+        
+        depth = min(int(request.args.get('depth', 2)), 4)
+        limit = min(int(request.args.get('limit', 500)), 5000)
+        subgraph = fraud_model.graph.subgraph(kind, parse_entity_id(entity_id), depth=depth, limit=limit)
+        if subgraph is None:
+            return jsonify({'success': False, 'error': f'Unknown {kind}: {entity_id}'}), 404
+        
+        return jsonify({'success': True, **subgraph})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/drift', methods=['GET'])
+@requires_startup
+def drift_report():
+    """Feature drift of scored traffic against the training baseline"""
+    if fraud_model.drift_monitor is None:
+        return jsonify({'success': False, 'error': 'No drift baseline. Please train the model first.'}), 400
+    
+    window = request.args.get('window')
+    report = fraud_model.drift_monitor.report(window)
+    if report is None:
+        return jsonify({'success': False, 'error': f'Unknown window: {window}'}), 404
+    
+    return jsonify({
+        'success': True,
+        'report': report,
+        'windows': list(fraud_model.drift_monitor.windows)
+    })
+
 @app.route('/api/save-model', methods=['POST'])
+@requires_startup
 def save_model():
     """Save trained models to a named version"""
     try:
@@ -244,7 +617,43 @@ def save_model():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/challengers', methods=['GET'])
+@requires_startup
+def list_challengers():
+    """Registered challengers and their disagreement with the champion"""
+    return jsonify({'success': True, 'challengers': fraud_model.challengers.summary()})
+
+@app.route('/api/challengers', methods=['POST'])
+@requires_startup
+def add_challenger():
+    """Score a saved model alongside the champion"""
+    try:
+        data = request.get_json() if request.is_json else {}
+        name = secure_filename(str((data or {}).get('name') or ''))
+        if not name:
+            return jsonify({'success': False, 'error': 'Model name is required'}), 400
+        path = os.path.join('models', name)
+        if not os.path.isdir(path):
+            return jsonify({'success': False, 'error': f'No saved model named {name}'}), 404
+        challenger = FraudDetectionModel(memory_budget=MEMORY_BUDGET)
+        challenger.load(path)
+        fraud_model.challengers.add(name, challenger, fraud_model)
+        return jsonify({'success': True, 'message': f'Challenger {name} registered',
+                        'challengers': list(fraud_model.challengers.models)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/challengers/<name>', methods=['DELETE'])
+@requires_startup
+def remove_challenger(name):
+    """Stop scoring a challenger"""
+    if name not in fraud_model.challengers.models:
+        return jsonify({'success': False, 'error': f'No challenger named {name}'}), 404
+    fraud_model.challengers.remove(name)
+    return jsonify({'success': True, 'challengers': list(fraud_model.challengers.models)})
+
 @app.route('/api/model-info', methods=['GET'])
+@requires_startup
 def model_info():
     """Get model information"""
     try:
@@ -264,6 +673,7 @@ def model_info():
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/load-model', methods=['POST'])
+@requires_startup
 def load_model():
     """Load previously saved models from disk"""
     try:
@@ -271,6 +681,7 @@ def load_model():
         name = (data or {}).get('name')
         path = os.path.join('models', name) if name else 'models'
         fraud_model.load(path)
+        run_features.clear()
         return jsonify({
             'success': True,
             'message': f"Models loaded from {path}",
@@ -282,4 +693,10 @@ def load_model():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # With the debug reloader only the child process that serves requests starts up
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_startup()
+    app.run(debug=True, port=5000)
+else:
+    # Imported by a WSGI server
+    start_background_startup()
\ No newline at end of file
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from graph_index import GRAPH_FEATURES
+
+CHALLENGER_WORKERS = 4
+
+class ChallengerPool:
+    """Saved models scored next to the champion on a shared feature matrix"""
+
+    def __init__(self, max_workers=CHALLENGER_WORKERS):
+        self.models = {}
+        self.stats = {}
+        self.last_scores = {}
+        self.max_workers = max_workers
+        self._executor = None
+
+    def __len__(self):
+        return len(self.models)
+
+    def add(self, name, model, champion):
+        """Register a trained model as a challenger of `champion`"""
+        if model.rf_model is None or model.xgb_model is None:
+            raise Exception(f"Challenger '{name}' is not trained")
+        unsupported = self.unsupported_features(champion, model)
+        if unsupported:
+            raise ValueError(
+                f"Challenger '{name}' needs features the champion does not compute: {', '.join(unsupported)}"
+            )
+        self.models[name] = model
+        self.stats[name] = {'rows': 0, 'disagreements': 0, 'champion_flagged': 0,
+                            'challenger_flagged': 0, 'abs_probability_diff': 0.0,
+                            'zero_filled_features': set()}
+
+    @staticmethod
+    def unsupported_features(champion, challenger):
+        """Challenger features the champion's pipeline never produces"""
+        if champion.graph is not None:
+            return []
+        return [col for col in challenger.feature_names or [] if col in GRAPH_FEATURES]
+
+    def remove(self, name):
+        """Stop scoring a challenger"""
+        self.models.pop(name, None)
+        self.stats.pop(name, None)
+        self.last_scores.pop(name, None)
+
+    def submit(self, champion, df_processed, X):
+        """Start scoring every challenger in parallel; returns futures to collect"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='challenger')
+        return {
+            name: self._executor.submit(self._score, champion, model, df_processed, X)
+            for name, model in self.models.items()
+        }
+
+    def collect(self, pending, champion_proba, champion_pred, threshold=0.5):
+        """Wait for challenger scores and record agreement with the champion"""
+        self.last_scores = {}
+        for name, future in pending.items():
+            proba, zero_filled = future.result()
+            pred = (proba > threshold).astype(int)
+            self.last_scores[name] = proba
+            stats = self.stats[name]
+            stats['rows'] += len(proba)
+            stats['disagreements'] += int((pred != champion_pred).sum())
+            stats['champion_flagged'] += int(champion_pred.sum())
+            stats['challenger_flagged'] += int(pred.sum())
+            stats['abs_probability_diff'] += float(np.abs(proba - champion_proba).sum())
+            stats['zero_filled_features'].update(zero_filled)
+
+    def summary(self):
+        """Cumulative disagreement and flag rates per challenger"""
+        summary = {}
+        for name, stats in self.stats.items():
+            rows = stats['rows']
+            summary[name] = {
+                'rows': rows,
+                'disagreement_rate': round(stats['disagreements'] / rows, 4) if rows else 0.0,
+                'champion_fraud_rate': round(stats['champion_flagged'] / rows, 4) if rows else 0.0,
+                'challenger_fraud_rate': round(stats['challenger_flagged'] / rows, 4) if rows else 0.0,
+                'mean_abs_probability_diff': round(stats['abs_probability_diff'] / rows, 4) if rows else 0.0,
+                # Features missing from the scored data, so the challenger saw 0 for them
+                'zero_filled_features': sorted(stats['zero_filled_features'])
+            }
+        return summary
+
+    @staticmethod
+    def _score(champion, challenger, df_processed, X):
+        """Ensemble probability of one challenger (and the features it got as 0), reusing the champion's features"""
+        X = X.copy()
+        # Re-encode categoricals only when the challenger learned different classes
+        for col, encoder in challenger.label_encoders.items():
+            champion_encoder = champion.label_encoders.get(col)
+            encoded_col = f'{col}_encoded'
+            if encoded_col not in X.columns or col not in df_processed.columns:
+                continue
+            if champion_encoder is not None and np.array_equal(champion_encoder.classes_, encoder.classes_):
+                continue
+            values = df_processed[col]
+            try:
+                if isinstance(values.dtype, pd.CategoricalDtype) and not values.isna().any():
+                    X[encoded_col] = encoder.transform(values.cat.categories.astype(str))[values.cat.codes.to_numpy()]
+                else:
+                    X[encoded_col] = encoder.transform(values.astype(str))
+            except:
+                X[encoded_col] = 0
+
+        # Line the shared matrix up with the challenger's training features; columns the
+        # champion wasn't trained on still come from the shared engineered frame
+        zero_filled = []
+        for col in challenger.feature_names:
+            if col in X.columns:
+                continue
+            if col in df_processed.columns:
+                X[col] = df_processed[col].fillna(0)
+            else:
+                X[col] = 0
+                zero_filled.append(col)
+        X = X[challenger.feature_names]
+        X_scaled = challenger.scaler.transform(
+            challenger._scaler_input(X, np.float32 if challenger.memory_budget else None)
+        )
+
+        rf_proba = challenger._classify(challenger.rf_model, X_scaled, 'RF')[1]
+        xgb_proba = challenger._classify(challenger.xgb_model, X_scaled, 'XGB')[1]
+        return (rf_proba + xgb_proba) / 2, zero_filled
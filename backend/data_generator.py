@@ -0,0 +1,242 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+CHUNK_ROWS = 1_000_000
+
+TRANSACTION_TYPES = np.array(['purchase', 'withdrawal', 'transfer'])
+TRANSACTION_TYPE_WEIGHTS = np.array([0.8, 0.12, 0.08])
+MERCHANT_CATEGORIES = np.array(['groceries', 'gas', 'restaurant', 'online', 'entertainment', 'travel'])
+MERCHANT_CATEGORY_WEIGHTS = np.array([0.3, 0.15, 0.2, 0.2, 0.1, 0.05])
+LOCATIONS = np.array(['New York', 'Los Angeles', 'Chicago', 'Houston', 'Miami'])
+
+# Relative transaction volume per hour of day
+HOURLY_WEIGHTS = np.array([
+    1, 0.6, 0.4, 0.3, 0.3, 0.5, 1.2, 2.5, 3.5, 4, 4.2, 4.5,
+    5, 4.8, 4.5, 4.3, 4.5, 5, 5.2, 4.8, 4, 3.2, 2.4, 1.6
+])
+HOURLY_CDF = np.concatenate([[0], np.cumsum(HOURLY_WEIGHTS) / HOURLY_WEIGHTS.sum()])
+
+FRAUD_PATTERNS = ['spike', 'burst', 'ring']
+
+class TransactionGenerator:
+    """Vectorized synthetic transactions with injected fraud patterns"""
+
+    def __init__(self, n_customers=100_000, n_merchants=10_000, start='2024-01-01', days=365,
+                 fraud_rate=0.01, pattern_mix=(0.4, 0.35, 0.25), seed=42):
+        self.n_customers = n_customers
+        self.n_merchants = n_merchants
+        self.start = pd.Timestamp(start)
+        self.days = days
+        self.fraud_rate = fraud_rate
+        self.pattern_mix = np.asarray(pattern_mix, dtype=float) / np.sum(pattern_mix)
+        self.seed = seed
+        self._population = None
+
+    def __getstate__(self):
+        # Workers rebuild the population from the seed rather than receiving it
+        state = self.__dict__.copy()
+        state['_population'] = None
+        return state
+
+    def _rng(self, *key):
+        """Independent random stream for a chunk (or the population)"""
+        # Keyed by chunk index, so output doesn't depend on how chunks map to workers
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=key))
+
+    def population(self):
+        """Customer and merchant attributes shared by every chunk"""
+        if self._population is None:
+            rng = self._rng(2 ** 32 - 1)
+            merchant_popularity = rng.pareto(1.2, self.n_merchants) + 1
+            self._population = {
+                'customer_scale': rng.lognormal(3.5, 0.7, self.n_customers),
+                'customer_location': rng.integers(0, len(LOCATIONS), self.n_customers),
+                'merchant_category': np.searchsorted(
+                    np.cumsum(MERCHANT_CATEGORY_WEIGHTS), rng.random(self.n_merchants) * MERCHANT_CATEGORY_WEIGHTS.sum()
+                ),
+                'merchant_cdf': np.cumsum(merchant_popularity) / merchant_popularity.sum()
+            }
+        return self._population
+
+    @staticmethod
+    def _weighted(rng, weights, size):
+        """Vectorized categorical draw"""
+        cdf = np.cumsum(weights) / np.sum(weights)
+        return np.minimum(np.searchsorted(cdf, rng.random(size)), len(weights) - 1)
+
+    @staticmethod
+    def _warp(uniform_days):
+        """Seconds from the start for uniform day offsets, following the hourly volume curve"""
+        days = np.floor(uniform_days)
+        return np.floor(days * 86400 + np.interp(uniform_days - days, HOURLY_CDF, np.arange(25) * 3600.0))
+
+    def generate_chunk(self, chunk_index, n_rows, n_chunks=1):
+        """Generate one chunk of transactions covering its slice of the time range"""
+        rng = self._rng(chunk_index)
+        population = self.population()
+
+        customers = rng.integers(0, self.n_customers, n_rows)
+        merchants = np.minimum(np.searchsorted(population['merchant_cdf'], rng.random(n_rows)), self.n_merchants - 1)
+        amounts = population['customer_scale'][customers] * rng.lognormal(0, 0.6, n_rows)
+        types = self._weighted(rng, TRANSACTION_TYPE_WEIGHTS, n_rows)
+        locations = population['customer_location'][customers].copy()
+        travelling = rng.random(n_rows) < 0.05
+        locations[travelling] = rng.integers(0, len(LOCATIONS), int(travelling.sum()))
+
+        # Chunks own consecutive slices of the period. Uniform time is warped through the
+        # hourly volume CDF within each day, which is monotonic, so chunks stay in order
+        chunk_days = self.days / n_chunks
+        uniform_days = chunk_index * chunk_days + np.sort(rng.random(n_rows)) * chunk_days
+        seconds = self._warp(uniform_days)
+        # Where the next chunk starts, in warped time
+        chunk_end = self._warp(np.array([(chunk_index + 1) * chunk_days]))[0]
+
+        fraud_pattern = np.zeros(n_rows, dtype=np.int8)  # 0 = legitimate, else 1 + FRAUD_PATTERNS index
+        n_fraud = rng.binomial(n_rows, self.fraud_rate) if n_rows else 0
+        # A multinomial split keeps every fraud row, however small the chunk
+        n_spike, n_burst, n_ring = rng.multinomial(n_fraud, self.pattern_mix)
+        burst_lengths = np.empty(0, dtype=int)
+        if n_burst:
+            # Bursts of 5-15 rows, the last one truncated so they add up to exactly n_burst
+            lengths = rng.integers(5, 16, n_burst // 5 + 1)
+            burst_lengths = lengths[:np.searchsorted(np.cumsum(lengths), n_burst) + 1]
+            burst_lengths[-1] -= burst_lengths.sum() - n_burst
+        # Each pattern gets its own rows; together they never exceed n_fraud <= n_rows
+        fraud_rows = rng.choice(n_rows, n_spike + n_burst + n_ring, replace=False)
+        spike_rows, burst_rows, ring_rows = np.split(fraud_rows, [n_spike, n_spike + n_burst])
+
+        # Amount spikes: one-off large transfers or withdrawals
+        rows = spike_rows
+        amounts[rows] *= rng.uniform(10, 50, len(rows))
+        types[rows] = rng.integers(1, 3, len(rows))
+        fraud_pattern[rows] = 1
+
+        # Bursts: one customer, many online transactions seconds apart
+        rows = burst_rows
+        if len(rows):
+            burst_id = np.repeat(np.arange(len(burst_lengths)), burst_lengths)
+            step = np.arange(len(rows)) - np.repeat(np.cumsum(burst_lengths) - burst_lengths, burst_lengths)
+            anchors = rows[np.cumsum(burst_lengths) - burst_lengths]
+            customers[rows] = customers[anchors][burst_id]
+            seconds[rows] = np.minimum(seconds[anchors][burst_id] + step * rng.integers(5, 60, len(rows)), chunk_end - 1)
+            online = np.flatnonzero(MERCHANT_CATEGORIES[population['merchant_category']] == 'online')
+            if len(online):
+                merchants[rows] = online[rng.integers(0, len(online), len(rows))]
+            fraud_pattern[rows] = 2
+
+        # Rings: small groups of customers cycling money through a few colluding merchants
+        rows = ring_rows
+        if len(rows):
+            n_rings = max(len(rows) // 50, 1)
+            ring_customers = rng.integers(0, self.n_customers, (n_rings, 6))
+            ring_merchants = rng.integers(0, self.n_merchants, (n_rings, 2))
+            ring_id = rng.integers(0, n_rings, len(rows))
+            customers[rows] = ring_customers[ring_id, rng.integers(0, 6, len(rows))]
+            merchants[rows] = ring_merchants[ring_id, rng.integers(0, 2, len(rows))]
+            types[rows] = 2
+            amounts[rows] = rng.uniform(500, 3000, len(rows))
+            fraud_pattern[rows] = 3
+
+        order = np.argsort(seconds, kind='stable')
+        pattern_names = np.array([''] + FRAUD_PATTERNS, dtype=object)
+        return pd.DataFrame({
+            'customer_id': 1000 + customers[order],
+            'merchant_id': 100 + merchants[order],
+            'amount': np.round(amounts[order], 2),
+            'transaction_type': pd.Categorical.from_codes(types[order], TRANSACTION_TYPES),
+            'merchant_category': pd.Categorical.from_codes(
+                population['merchant_category'][merchants[order]], MERCHANT_CATEGORIES
+            ),
+            'timestamp': self.start + pd.to_timedelta(seconds[order], unit='s'),
+            'location': pd.Categorical.from_codes(locations[order], LOCATIONS),
+            'is_fraud': (fraud_pattern[order] > 0).astype(np.int8),
+            'fraud_pattern': pattern_names[fraud_pattern[order]]
+        })
+
+    def chunk_sizes(self, n_rows, chunk_rows=CHUNK_ROWS):
+        """Split a row count into chunk sizes"""
+        n_chunks = max(int(np.ceil(n_rows / chunk_rows)), 1)
+        sizes = np.full(n_chunks, n_rows // n_chunks)
+        sizes[:n_rows % n_chunks] += 1
+        return sizes.tolist()
+
+    def generate(self, n_rows, chunk_rows=CHUNK_ROWS):
+        """Generate a whole dataset in memory (small sizes only)"""
+        sizes = self.chunk_sizes(n_rows, chunk_rows)
+        return pd.concat(
+            [self.generate_chunk(i, size, len(sizes)) for i, size in enumerate(sizes)], ignore_index=True
+        )
+
+    def write(self, path, n_rows, workers=None, chunk_rows=CHUNK_ROWS):
+        """Generate chunks in parallel processes and stream them to a CSV or Parquet file"""
+        file_format = 'parquet' if path.endswith('.parquet') else 'csv'
+        if file_format == 'parquet' and pa is None:
+            raise ValueError("Parquet output requires pyarrow")
+
+        sizes = self.chunk_sizes(n_rows, chunk_rows)
+        tasks = [(self, i, size, len(sizes), file_format) for i, size in enumerate(sizes)]
+        workers = workers or os.cpu_count() or 1
+        writer = None
+        with Pool(min(workers, len(tasks))) as pool, open(path, 'wb') as f:
+            # imap keeps chunk order while later chunks are still being generated
+            for i, encoded in enumerate(pool.imap(_encode_chunk, tasks)):
+                if file_format == 'csv':
+                    f.write(encoded)
+                else:
+                    if writer is None:
+                        writer = pq.ParquetWriter(f, encoded.schema, compression='zstd')
+                    writer.write_table(encoded)
+            if writer is not None:
+                writer.close()
+        return {'path': path, 'rows': int(sum(sizes)), 'chunks': len(sizes), 'format': file_format}
+
+def _encode_chunk(task):
+    """Worker: generate one chunk and serialize it"""
+    generator, chunk_index, n_rows, n_chunks, file_format = task
+    df = generator.generate_chunk(chunk_index, n_rows, n_chunks)
+    if pa is None:
+        return df.to_csv(index=False, header=(chunk_index == 0)).encode('utf-8')
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.set_column(
+        table.schema.get_field_index('timestamp'), 'timestamp', table.column('timestamp').cast(pa.timestamp('s'))
+    )
+    if file_format == 'parquet':
+        return table
+    # Arrow's CSV writer is an order of magnitude faster than DataFrame.to_csv
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(table, sink, pa_csv.WriteOptions(include_header=(chunk_index == 0)))
+    return sink.getvalue().to_pybytes()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate synthetic transactions for load testing')
+    parser.add_argument('output', help='Output file (.csv or .parquet)')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--customers', type=int, default=100_000)
+    parser.add_argument('--merchants', type=int, default=10_000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--fraud-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    generator = TransactionGenerator(
+        n_customers=args.customers, n_merchants=args.merchants, days=args.days,
+        fraud_rate=args.fraud_rate, seed=args.seed
+    )
+    started = time.time()
+    result = generator.write(args.output, args.rows, workers=args.workers, chunk_rows=args.chunk_rows)
+    print(f"Wrote {result['rows']} rows in {result['chunks']} chunks to {result['path']} "
+          f"in {time.time() - started:.1f}s")
@@ -1,8 +1,35 @@
 import pandas as pd
 import numpy as np
 from io import StringIO
+import codecs
 import json
 
+try:
+    import pyarrow.csv as pa_csv
+    CSV_ENGINE = 'pyarrow'  # multithreaded parser
+except ImportError:
+    pa_csv = None
+    CSV_ENGINE = 'c'
+
+# Declared schema for transaction uploads; columns not listed here are inferred
+TRANSACTION_SCHEMA = {
+    'customer_id': 'int64',
+    'merchant_id': 'int64',
+    'amount': 'float64',
+    'transaction_type': 'category',
+    'merchant_category': 'category',
+    'location': 'category',
+}
+TIMESTAMP_COLUMN = 'timestamp'
+TIMESTAMP_FORMAT = 'ISO8601'
+
+# Columns the models actually read from an upload
+MODEL_INPUT_COLUMNS = list(TRANSACTION_SCHEMA) + [TIMESTAMP_COLUMN]
+
+SAMPLE_ROWS = 3
+READ_CHUNK_BYTES = 1024 * 1024
+COUNT_CHUNK_ROWS = 100_000
+
 class DataProcessor:
     @staticmethod
     def validate_csv(file_content):
@@ -19,6 +46,93 @@ class DataProcessor:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def is_utf8(filepath):
+        """Check that the whole file decodes as UTF-8, reading it in chunks"""
+        # Incremental decoder tolerates a multi-byte character cut at a chunk boundary
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            with open(filepath, 'rb') as f:
+                while True:
+                    chunk = f.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+            return True
+        except UnicodeDecodeError:
+            return False
+    
+    @staticmethod
+    def count_rows(filepath):
+        """Count data rows exactly (quoted newlines, blank lines) while parsing only the first column"""
+        first_column = pd.read_csv(filepath, nrows=0).columns[:1].tolist()
+        if not first_column:
+            return 0
+        if pa_csv is not None:
+            reader = pa_csv.open_csv(
+                filepath,
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(include_columns=first_column)
+            )
+            return sum(batch.num_rows for batch in reader)
+        return sum(len(chunk) for chunk in pd.read_csv(
+            filepath, usecols=[0], dtype=str, chunksize=COUNT_CHUNK_ROWS
+        ))
+    
+    @staticmethod
+    def apply_schema(df):
+        """Cast a frame to the declared transaction schema"""
+        for col, dtype in TRANSACTION_SCHEMA.items():
+            if col in df.columns and str(df[col].dtype) != dtype:
+                try:
+                    df[col] = df[col].astype(dtype)
+                except (ValueError, TypeError):
+                    pass
+        if TIMESTAMP_COLUMN in df.columns and not pd.api.types.is_datetime64_any_dtype(df[TIMESTAMP_COLUMN]):
+            raw = df[TIMESTAMP_COLUMN]
+            # ISO8601 is the fast path; anything it can't read gets pandas' format inference
+            parsed = pd.to_datetime(raw, format=TIMESTAMP_FORMAT, errors='coerce')
+            unparsed = parsed.isna() & raw.notna()
+            if unparsed.any():
+                parsed[unparsed] = pd.to_datetime(raw[unparsed].astype(str), errors='coerce')
+            df[TIMESTAMP_COLUMN] = parsed
+        return df
+    
+    @staticmethod
+    def validate_csv_file(filepath, sample_rows=SAMPLE_ROWS):
+        """Validate a CSV on disk from its header and a few sample rows"""
+        try:
+            sample = pd.read_csv(filepath, nrows=sample_rows)
+            sample = DataProcessor.apply_schema(sample)
+            sample_json = sample.copy()
+            if TIMESTAMP_COLUMN in sample_json.columns:
+                sample_json[TIMESTAMP_COLUMN] = sample_json[TIMESTAMP_COLUMN].astype(str)
+            return {
+                'success': True,
+                'rows': DataProcessor.count_rows(filepath),
+                'columns': list(sample.columns),
+                'dtypes': sample.dtypes.astype(str).to_dict(),
+                'sample': sample_json.to_dict(orient='records')
+            }
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def read_transactions(filepath, usecols=None):
+        """Parse a transaction CSV with the declared schema"""
+        columns = list(pd.read_csv(filepath, nrows=0).columns)
+        if usecols is not None:
+            wanted = set(usecols)
+            columns = [col for col in columns if col in wanted]
+        dtypes = {col: dtype for col, dtype in TRANSACTION_SCHEMA.items() if col in columns}
+        try:
+            df = pd.read_csv(filepath, usecols=columns, dtype=dtypes, engine=CSV_ENGINE)
+        except (ValueError, TypeError):
+            # Contents don't match the declared dtypes (e.g. string ids), let pandas infer
+            df = pd.read_csv(filepath, usecols=columns, engine=CSV_ENGINE)
+        return DataProcessor.apply_schema(df)
+    
     @staticmethod
     def generate_sample_data(n_samples=1000):
         """Generate sample transaction data for testing"""
@@ -89,7 +203,10 @@ class DataProcessor:
         high_confidence_frauds = int((df['confidence_score'] > 0.8).sum()) if 'confidence_score' in df.columns else 0
         
         # Risk distribution
-        risk_distribution = df['risk_level'].value_counts().to_dict() if 'risk_level' in df.columns else {}
+        risk_distribution = {}
+        if 'risk_level' in df.columns:
+            risk_counts = df['risk_level'].value_counts()
+            risk_distribution = risk_counts[risk_counts > 0].to_dict()
         
         # Category analysis
         category_fraud = {}
@@ -97,7 +214,7 @@ class DataProcessor:
             # Convert to ensure we're working with proper data types
             df_copy = df.copy()
             df_copy['is_fraud_predicted'] = pd.to_numeric(df_copy['is_fraud_predicted'], errors='coerce').fillna(0)
-            category_stats = df_copy.groupby('merchant_category')['is_fraud_predicted'].agg(['count', 'sum']).reset_index()
+            category_stats = df_copy.groupby('merchant_category', observed=True)['is_fraud_predicted'].agg(['count', 'sum']).reset_index()
             category_stats['fraud_rate'] = category_stats['sum'] / category_stats['count'] * 100
             category_fraud = category_stats.set_index('merchant_category')['fraud_rate'].to_dict()
         
@@ -108,7 +225,7 @@ class DataProcessor:
             'fraud_percentage': round(frauds / total * 100, 2) if total > 0 else 0,
             'avg_fraud_probability': float(df['ensemble_fraud_probability'].mean()),
             'max_fraud_probability': float(df['ensemble_fraud_probability'].max()),
-            'high_risk_count': int((df['ensemble_fraud_probability'] > 0.7).sum()),
+            'high_risk_count': int((df['risk_level'] == 'Critical').sum()),
             'avg_confidence': round(avg_confidence * 100, 2),
             'high_confidence_frauds': high_confidence_frauds,
             'by_risk_level': risk_distribution,
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+RISK_LABELS = np.array(['Low', 'Medium', 'High', 'Critical'], dtype=object)
+AGREEMENT_LABELS = np.array(['unanimous', 'majority', 'split'], dtype=object)
+
+# Raw columns of a results frame kept per run so decisions can be recomputed without re-scoring
+SCORE_COLUMNS = ['rf_fraud_probability', 'xgb_fraud_probability', 'is_anomaly', 'is_fraud_predicted']
+
+class DecisionPolicy:
+    """Decision threshold, risk bands and ensemble weights applied to model probabilities"""
+
+    def __init__(self, threshold=0.5, risk_bands=(0.3, 0.5, 0.7), weights=(0.5, 0.5)):
+        threshold = float(threshold)
+        risk_bands = np.asarray(risk_bands, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        if not 0 < threshold < 1:
+            raise ValueError("Threshold must be between 0 and 1")
+        if risk_bands.shape != (len(RISK_LABELS) - 1,) or np.any(np.diff(risk_bands) < 0) \
+                or risk_bands.min() < 0 or risk_bands.max() > 1:
+            raise ValueError("Risk bands must be three ascending probabilities (Medium, High, Critical)")
+        if weights.shape != (2,) or weights.min() < 0 or weights.sum() == 0:
+            raise ValueError("Weights must be two non-negative numbers (Random Forest, XGBoost)")
+        self.threshold = threshold
+        self.risk_bands = risk_bands
+        self.weights = weights / weights.sum()
+
+    def to_dict(self):
+        return {
+            'threshold': self.threshold,
+            'risk_bands': self.risk_bands.tolist(),
+            'weights': self.weights.tolist()
+        }
+
+    def ensemble_proba(self, rf_proba, xgb_proba):
+        """Weighted average of the classifier probabilities"""
+        return self.weights[0] * rf_proba + self.weights[1] * xgb_proba
+
+    def votes(self, proba):
+        """Fraud decisions at the threshold"""
+        return (proba > self.threshold).astype(int)
+
+    def risk_codes(self, proba):
+        """Index into RISK_LABELS for each probability (bands are exclusive lower bounds)"""
+        return np.searchsorted(self.risk_bands, proba, side='left')
+
+    def confidence(self, proba):
+        """Distance from the threshold, scaled to 0-1"""
+        return np.abs(proba - self.threshold) / max(self.threshold, 1 - self.threshold)
+
+    @staticmethod
+    def agreement_codes(rf_votes, xgb_votes, iso_votes):
+        """Index into AGREEMENT_LABELS: number of distinct votes minus one"""
+        return ((rf_votes != xgb_votes).astype(int) +
+                ((iso_votes != rf_votes) & (iso_votes != xgb_votes)).astype(int))
+
+    def apply(self, rf_proba, xgb_proba, iso_votes, fixed_decisions=None):
+        """Decisions for a batch; rows with a fixed decision (>= 0) keep it"""
+        ensemble_proba = self.ensemble_proba(rf_proba, xgb_proba)
+        rf_votes, xgb_votes, decisions = self.votes(rf_proba), self.votes(xgb_proba), self.votes(ensemble_proba)
+        if fixed_decisions is not None:
+            fixed = fixed_decisions >= 0
+            rf_votes[fixed] = xgb_votes[fixed] = decisions[fixed] = fixed_decisions[fixed]
+        return {
+            'ensemble_proba': ensemble_proba,
+            'rf_votes': rf_votes,
+            'xgb_votes': xgb_votes,
+            'decisions': decisions,
+            'risk_codes': self.risk_codes(ensemble_proba),
+            'agreement_codes': self.agreement_codes(rf_votes, xgb_votes, iso_votes),
+            'confidence': self.confidence(ensemble_proba)
+        }
+
+    @staticmethod
+    def extract_scores(results_df):
+        """Compact per-run arrays needed to re-decide a scored batch"""
+        scores = {
+            'rf_proba': results_df['rf_fraud_probability'].to_numpy(dtype=np.float64),
+            'xgb_proba': results_df['xgb_fraud_probability'].to_numpy(dtype=np.float64),
+            'iso_votes': results_df['is_anomaly'].to_numpy(dtype=np.int8),
+            'decisions': results_df['is_fraud_predicted'].to_numpy(dtype=np.int8),
+            # Rows decided by the cascade screening model were never scored by the ensemble
+            'fixed_decisions': np.full(len(results_df), -1, dtype=np.int8)
+        }
+        if 'cascade_stage' in results_df.columns:
+            screened = (results_df['cascade_stage'] == 'screen').to_numpy()
+            scores['fixed_decisions'][screened] = scores['decisions'][screened]
+        if 'merchant_category' in results_df.columns:
+            categories = pd.Categorical(results_df['merchant_category'].astype(str))
+            scores['category_codes'] = categories.codes.astype(np.int32)
+            scores['categories'] = np.asarray(categories.categories, dtype=str)
+        return scores
+
+    @staticmethod
+    def save_scores(scores, path):
+        np.savez(path, **scores)
+
+    @staticmethod
+    def load_scores(path):
+        with np.load(path, allow_pickle=False) as stored:
+            return {key: stored[key] for key in stored.files}
+
+    def evaluate(self, scores):
+        """Re-decide a stored run; returns the columns get_statistics reads plus the decisions"""
+        decided = self.apply(scores['rf_proba'], scores['xgb_proba'], scores['iso_votes'],
+                             scores['fixed_decisions'])
+        frame = pd.DataFrame({
+            'is_fraud_predicted': decided['decisions'],
+            'is_anomaly': scores['iso_votes'],
+            'ensemble_fraud_probability': decided['ensemble_proba'],
+            'risk_level': pd.Categorical.from_codes(decided['risk_codes'], RISK_LABELS),
+            'agreement_state': pd.Categorical.from_codes(decided['agreement_codes'], AGREEMENT_LABELS),
+            'confidence_score': decided['confidence']
+        })
+        if 'category_codes' in scores:
+            frame['merchant_category'] = pd.Categorical.from_codes(scores['category_codes'], scores['categories'])
+        return frame
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+
+DRIFT_BINS = 10
+WINDOW_MINUTES = 60
+MAX_WINDOWS = 168  # a week of hourly windows
+
+# Conventional PSI cut-offs
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+class DriftMonitor:
+    """Binned feature histograms from training, updated incrementally while scoring"""
+
+    def __init__(self, n_bins=DRIFT_BINS, window_minutes=WINDOW_MINUTES, max_windows=MAX_WINDOWS):
+        self.n_bins = n_bins
+        self.window_minutes = window_minutes
+        self.max_windows = max_windows
+        self.feature_names = []
+        self.edges = []
+        self.baseline = []
+        self.totals = []
+        self.windows = OrderedDict()
+
+    def fit(self, X):
+        """Build the training baseline from a feature frame"""
+        self.feature_names = list(X.columns)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.edges, self.baseline = [], []
+        for col in self.feature_names:
+            values = X[col].to_numpy(dtype=np.float64)
+            # Inner edges only: the outer bins are open-ended so unseen ranges still land somewhere
+            edges = np.unique(np.quantile(values, quantiles)) if len(values) else np.empty(0)
+            self.edges.append(edges)
+            self.baseline.append(self._histogram(values, edges))
+        self.totals = [np.zeros_like(counts) for counts in self.baseline]
+        self.windows = OrderedDict()
+        return self
+
+    @staticmethod
+    def _histogram(values, edges):
+        """Counts per bin for one feature"""
+        return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+    def _window_key(self, when=None):
+        """Start of the time window a batch falls in"""
+        when = when or datetime.now()
+        minute_of_day = (when.hour * 60 + when.minute) // self.window_minutes * self.window_minutes
+        return when.replace(hour=minute_of_day // 60, minute=minute_of_day % 60,
+                            second=0, microsecond=0).isoformat()
+
+    def update(self, X, when=None):
+        """Add a scored batch to the running and per-window histograms"""
+        key = self._window_key(when)
+        window = self.windows.get(key)
+        if window is None:
+            window = [np.zeros_like(counts) for counts in self.baseline]
+            self.windows[key] = window
+            while len(self.windows) > self.max_windows:
+                self.windows.popitem(last=False)
+        for i, col in enumerate(self.feature_names):
+            values = X[col].to_numpy(dtype=np.float64) if col in X.columns else np.zeros(len(X))
+            counts = self._histogram(values, self.edges[i])
+            self.totals[i] += counts
+            window[i] += counts
+
+    @staticmethod
+    def psi(expected, actual):
+        """Population stability index between two histograms"""
+        expected = (expected + 0.5) / (expected.sum() + 0.5 * len(expected))
+        actual = (actual + 0.5) / (actual.sum() + 0.5 * len(actual))
+        return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+    @staticmethod
+    def ks(expected, actual):
+        """Kolmogorov-Smirnov distance between two binned distributions"""
+        if expected.sum() == 0 or actual.sum() == 0:
+            return 0.0
+        return float(np.max(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum())))
+
+    def report(self, window=None):
+        """PSI and KS per feature for all scored data or one time window"""
+        if window is None:
+            histograms = self.totals
+        elif window in self.windows:
+            histograms = self.windows[window]
+        else:
+            return None
+
+        rows = int(histograms[0].sum()) if histograms else 0
+        features = {}
+        for col, expected, actual in zip(self.feature_names, self.baseline, histograms):
+            psi = self.psi(expected, actual) if rows else 0.0
+            features[col] = {
+                'psi': round(psi, 4),
+                'ks': round(self.ks(expected, actual), 4),
+                'status': 'significant' if psi >= PSI_SIGNIFICANT else ('moderate' if psi >= PSI_MODERATE else 'stable')
+            }
+        return {
+            'window': window or 'all',
+            'rows': rows,
+            'baseline_rows': int(self.baseline[0].sum()) if self.baseline else 0,
+            'features': features,
+            'drifted_features': [col for col, stats in features.items() if stats['status'] != 'stable']
+        }
@@ -0,0 +1,236 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+INITIAL_CAPACITY = 1024
+CUSTOMER = 'customer'
+MERCHANT = 'merchant'
+
+# Columns added to the feature frame by TransactionGraph.features
+GRAPH_FEATURES = [
+    'customer_degree', 'merchant_degree',
+    'customer_fraud_count', 'merchant_fraud_count',
+    'component_size', 'component_fraud_count'
+]
+
+class TransactionGraph:
+    """Incremental customer-merchant graph with union-find components"""
+
+    def __init__(self):
+        self.node_index = {}   # (kind, id) -> node
+        self.node_keys = []    # node -> (kind, id)
+        self.adjacency = []    # node -> list of neighbouring nodes
+        self.edges = set()
+        self.n_nodes = 0
+        self.n_customers = 0
+        self.n_components = 0
+        self.n_fraud = 0
+        self.parent = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.component_size = np.zeros(INITIAL_CAPACITY, dtype=np.int64)   # valid at roots
+        self.component_fraud = np.zeros(INITIAL_CAPACITY, dtype=np.int64)  # valid at roots
+        self.degree = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.fraud_count = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.transaction_count = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+
+    def _grow(self, needed):
+        """Double array capacity until `needed` nodes fit"""
+        capacity = len(self.parent)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('parent', 'component_size', 'component_fraud', 'degree',
+                     'fraud_count', 'transaction_count'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _nodes(self, kind, ids, create=True):
+        """Map raw ids to node numbers, registering unseen ids when `create` is set"""
+        codes, uniques = pd.factorize(np.asarray(ids))
+        unique_nodes = np.empty(len(uniques), dtype=np.int64)
+        new_keys = []
+        for i, raw_id in enumerate(uniques.tolist()):
+            key = (kind, raw_id)
+            node = self.node_index.get(key)
+            if node is None:
+                if not create:
+                    node = -1
+                else:
+                    node = self.n_nodes + len(new_keys)
+                    self.node_index[key] = node
+                    new_keys.append(key)
+            unique_nodes[i] = node
+
+        if new_keys:
+            start = self.n_nodes
+            self._grow(start + len(new_keys))
+            new_nodes = np.arange(start, start + len(new_keys))
+            self.parent[new_nodes] = new_nodes
+            self.component_size[new_nodes] = 1
+            self.node_keys.extend(new_keys)
+            self.adjacency.extend([] for _ in new_keys)
+            self.n_nodes += len(new_keys)
+            if kind == CUSTOMER:
+                self.n_customers += len(new_keys)
+            self.n_components += len(new_keys)
+        return unique_nodes[codes] if len(codes) else np.empty(0, dtype=np.int64)
+
+    def _find(self, node):
+        """Root of a single node's component (path halving)"""
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _roots(self, nodes):
+        """Vectorized component roots for an array of nodes"""
+        roots = self.parent[nodes]
+        while True:
+            grandparents = self.parent[roots]
+            if np.array_equal(grandparents, roots):
+                break
+            roots = grandparents
+        # Point the queried nodes straight at their roots
+        self.parent[nodes] = roots
+        return roots
+
+    def _union_edges(self, a_nodes, b_nodes):
+        """Merge the components joined by a batch of edges"""
+        a_roots, b_roots = self._roots(a_nodes), self._roots(b_nodes)
+        joining = a_roots != b_roots
+        if not joining.any():
+            return
+        a_roots, b_roots = a_roots[joining], b_roots[joining]
+
+        # Group the touched roots into the components the batch creates
+        roots, inverse = np.unique(np.concatenate([a_roots, b_roots]), return_inverse=True)
+        n_joins = len(a_roots)
+        links = sp.coo_matrix(
+            (np.ones(n_joins), (inverse[:n_joins], inverse[n_joins:])), shape=(len(roots), len(roots))
+        )
+        n_groups, groups = connected_components(links, directed=False)
+
+        # Union by size: the largest root in each group becomes the new root
+        sizes = self.component_size[roots]
+        order = np.lexsort((sizes, groups))
+        leaders = np.empty(n_groups, dtype=np.int64)
+        leaders[groups[order]] = roots[order]
+        group_size = np.bincount(groups, weights=sizes, minlength=n_groups)
+        group_fraud = np.bincount(groups, weights=self.component_fraud[roots], minlength=n_groups)
+        self.parent[roots] = leaders[groups]
+        self.component_size[leaders] = group_size.astype(np.int64)
+        self.component_fraud[leaders] = group_fraud.astype(np.int64)
+        self.n_components -= len(roots) - n_groups
+
+    def add_transactions(self, customer_ids, merchant_ids, fraud=None):
+        """Add a batch of transactions and return their customer and merchant nodes"""
+        customer_nodes = self._nodes(CUSTOMER, customer_ids)
+        merchant_nodes = self._nodes(MERCHANT, merchant_ids)
+        np.add.at(self.transaction_count, customer_nodes, 1)
+        np.add.at(self.transaction_count, merchant_nodes, 1)
+
+        # Only edges never seen before touch degrees, adjacency and components
+        edges = self.edges
+        edge_keys = np.unique((customer_nodes << 32) | merchant_nodes).tolist()
+        new_keys = np.array([key for key in edge_keys if key not in edges], dtype=np.int64)
+        if len(new_keys):
+            edges.update(new_keys.tolist())
+            customers, merchants = new_keys >> 32, new_keys & 0xFFFFFFFF
+            np.add.at(self.degree, customers, 1)
+            np.add.at(self.degree, merchants, 1)
+            adjacency = self.adjacency
+            for customer, merchant in zip(customers.tolist(), merchants.tolist()):
+                adjacency[customer].append(merchant)
+                adjacency[merchant].append(customer)
+            self._union_edges(customers, merchants)
+
+        if fraud is not None:
+            self.record_fraud(customer_nodes, merchant_nodes, fraud)
+        return customer_nodes, merchant_nodes
+
+    def record_fraud(self, customer_nodes, merchant_nodes, fraud):
+        """Count fraudulent transactions against their nodes and components"""
+        fraud = np.asarray(fraud) == 1
+        if not fraud.any():
+            return
+        np.add.at(self.fraud_count, customer_nodes[fraud], 1)
+        np.add.at(self.fraud_count, merchant_nodes[fraud], 1)
+        np.add.at(self.component_fraud, self._roots(customer_nodes[fraud]), 1)
+        self.n_fraud += int(fraud.sum())
+
+    def features(self, customer_nodes, merchant_nodes):
+        """Graph features per transaction"""
+        roots = self._roots(customer_nodes)
+        return {
+            'customer_degree': self.degree[customer_nodes],
+            'merchant_degree': self.degree[merchant_nodes],
+            'customer_fraud_count': self.fraud_count[customer_nodes],
+            'merchant_fraud_count': self.fraud_count[merchant_nodes],
+            'component_size': self.component_size[roots],
+            'component_fraud_count': self.component_fraud[roots]
+        }
+
+    def _describe(self, node):
+        """JSON-ready description of one node"""
+        kind, raw_id = self.node_keys[node]
+        if isinstance(raw_id, float) and raw_id.is_integer():
+            raw_id = int(raw_id)
+        return {
+            'id': f'{kind}:{raw_id}',
+            'type': kind,
+            'entity_id': raw_id,
+            'degree': int(self.degree[node]),
+            'transactions': int(self.transaction_count[node]),
+            'fraud_count': int(self.fraud_count[node])
+        }
+
+    def subgraph(self, kind, entity_id, depth=2, limit=500):
+        """Breadth-first neighbourhood of a customer or merchant"""
+        start = self._nodes(kind, [entity_id], create=False)[0]
+        if start < 0:
+            return None
+
+        seen = {start: 0}
+        queue = deque([start])
+        edges = []
+        truncated = False
+        while queue:
+            node = queue.popleft()
+            if seen[node] >= depth:
+                continue
+            for neighbour in self.adjacency[node]:
+                if neighbour not in seen:
+                    if len(seen) >= limit:
+                        truncated = True
+                        continue
+                    seen[neighbour] = seen[node] + 1
+                    queue.append(neighbour)
+                edges.append((node, neighbour))
+
+        # Each undirected edge once, only between returned nodes
+        edge_list = sorted({(min(a, b), max(a, b)) for a, b in edges if a in seen and b in seen})
+        root = self._find(start)
+        return {
+            'center': self._describe(start)['id'],
+            'nodes': [self._describe(node) for node in seen],
+            'edges': [{'source': self._describe(a)['id'], 'target': self._describe(b)['id']} for a, b in edge_list],
+            'component_size': int(self.component_size[root]),
+            'component_fraud_count': int(self.component_fraud[root]),
+            'truncated': truncated
+        }
+
+    def summary(self):
+        """Size of the graph"""
+        return {
+            'nodes': self.n_nodes,
+            'customers': self.n_customers,
+            'merchants': self.n_nodes - self.n_customers,
+            'edges': len(self.edges),
+            'components': self.n_components,
+            'fraud_transactions': self.n_fraud
+        }
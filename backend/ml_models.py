@@ -2,22 +2,83 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.ensemble import RandomForestClassifier, IsolationForest
+from sklearn.tree import DecisionTreeRegressor
 from sklearn.model_selection import train_test_split
 import xgboost as xgb
 import joblib
+from reason_codes import ReasonCodes
+from graph_index import TransactionGraph, GRAPH_FEATURES
+from drift_monitor import DriftMonitor
+from challengers import ChallengerPool
+from decision_policy import DecisionPolicy, RISK_LABELS, AGREEMENT_LABELS
 import os
 from datetime import datetime
 
+# Narrow integer types for bounded calendar features in memory-budget mode
+SMALL_INT_FEATURES = {
+    'hour': np.int8,
+    'day_of_week': np.int8,
+    'day_of_month': np.int8,
+}
+
+# Labelled (training) rows are added to the transaction graph in this many sequential chunks
+GRAPH_LABEL_CHUNKS = 10
+
+# State that scoring updates and a warm-up batch must leave untouched
+WARM_UP_PRESERVED = ['drift_monitor', 'graph', '_graph_nodes', 'challengers', 'cascade_stats',
+                     'last_features', 'memory_report', 'feature_names']
+
+# Screening model distilled from the ensemble for cascade scoring
+SCREEN_MAX_DEPTH = 6
+SCREEN_MIN_SAMPLES_LEAF = 5
+
 class FraudDetectionModel:
-    def __init__(self):
+    def __init__(self, memory_budget=False, max_memory_mb=None,
+                 cascade=False, cascade_band=(None, 1.0), recall_floor=0.95,
+                 reason_threshold=0.5, reason_top_k=3, graph_features=False,
+                 drift_monitoring=True):
         self.rf_model = None
         self.xgb_model = None
         self.isolation_forest = None
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_names = None
+        # Memory-budget mode: float32/small-int/categorical dtypes and in-place scaling
+        self.memory_budget = memory_budget or max_memory_mb is not None
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        self.memory_report = None
+        # Cascade mode: only rows with a screening score inside the band reach the ensemble.
+        # A lower bound of None is calibrated on the holdout to keep recall >= recall_floor.
+        # Rows above the upper bound are flagged by the screen alone; the screen predicts
+        # probabilities, so at 1.0 it only ever clears legitimate rows.
+        low, high = cascade_band
+        if not 0 <= high <= 1 or (low is not None and not 0 <= low <= high):
+            raise ValueError("Cascade band must satisfy 0 <= low <= high <= 1")
+        self.cascade = cascade
+        self.cascade_band_config = cascade_band
+        self.cascade_band = None
+        self.recall_floor = recall_floor
+        self.screen_model = None
+        self.cascade_stats = None
+        # Reason codes are only computed for rows above reason_threshold (None disables)
+        self.reason_threshold = reason_threshold
+        self.reason_top_k = reason_top_k
+        self.last_features = None
+        # Customer-merchant graph, updated as transactions are trained on and scored
+        self.graph_features = graph_features
+        self.graph = TransactionGraph() if graph_features else None
+        self._graph_nodes = None
+        # Training-baseline histograms that scored batches are compared against
+        self.drift_monitoring = drift_monitoring
+        self.drift_monitor = None
+
+        # Saved models scored alongside this one (champion) without affecting its decisions
+        self.challengers = ChallengerPool()
+        
+        # Threshold, risk bands and ensemble weights turning probabilities into decisions
+        self.policy = DecisionPolicy()
         
-    def prepare_features(self, df):
+    def prepare_features(self, df, fraud_labels=None):
         """Engineer features from transaction data"""
         df = df.copy()
         
@@ -66,18 +127,29 @@ class FraudDetectionModel:
         # Categorical encoding
         categorical_cols = ['merchant_category', 'transaction_type']
         for col in categorical_cols:
+            values = df[col]
+            is_categorical = isinstance(values.dtype, pd.CategoricalDtype) and not values.isna().any()
             if col not in self.label_encoders:
                 self.label_encoders[col] = LabelEncoder()
-                df[f'{col}_encoded'] = self.label_encoders[col].fit_transform(
-                    df[col].astype(str)
-                )
-            else:
-                try:
+                if is_categorical:
+                    # Encode each category once and broadcast through the codes
+                    self.label_encoders[col].fit(values.cat.categories.astype(str))
+                else:
+                    self.label_encoders[col].fit(values.astype(str))
+            try:
+                if is_categorical:
                     df[f'{col}_encoded'] = self.label_encoders[col].transform(
-                        df[col].astype(str)
+                        values.cat.categories.astype(str)
+                    )[values.cat.codes.to_numpy()]
+                else:
+                    df[f'{col}_encoded'] = self.label_encoders[col].transform(
+                        values.astype(str)
                     )
-                except:
-                    df[f'{col}_encoded'] = 0
+            except:
+                df[f'{col}_encoded'] = 0
+        
+        # The graph is keyed on the original ids; the aggregations below coerce them to numbers
+        raw_ids = {col: df[col].fillna(0).to_numpy() for col in ('customer_id', 'merchant_id') if col in df.columns}
         
         # Statistical aggregations per merchant
         if 'merchant_id' in df.columns:
@@ -104,8 +176,125 @@ class FraudDetectionModel:
             customer_velocity = df.groupby('customer_id').size().reset_index(name='transaction_velocity')
             df = df.merge(customer_velocity, on='customer_id', how='left')
         
+        # Customer-merchant graph features
+        self._graph_nodes = None
+        if self.graph is not None and len(raw_ids) == 2:
+            graph_features, self._graph_nodes = self._graph_features(
+                raw_ids['customer_id'], raw_ids['merchant_id'], fraud_labels
+            )
+            for col, values in graph_features.items():
+                df[col] = values
+        
+        if self.memory_budget:
+            df = self._downcast(df)
+        
         return df
     
+    def _graph_features(self, customer_ids, merchant_ids, fraud_labels=None):
+        """Add transactions to the graph and read back graph features as of each row"""
+        if fraud_labels is None:
+            customer_nodes, merchant_nodes = self.graph.add_transactions(customer_ids, merchant_ids)
+            return self.graph.features(customer_nodes, merchant_nodes), (customer_nodes, merchant_nodes)
+        
+        # Labelled rows go in sequential chunks so fraud counts only reflect earlier chunks,
+        # the same view of history that scoring gets (and no label leakage)
+        chunks = []
+        for rows in np.array_split(np.arange(len(customer_ids)), min(GRAPH_LABEL_CHUNKS, max(len(customer_ids), 1))):
+            customer_nodes, merchant_nodes = self.graph.add_transactions(customer_ids[rows], merchant_ids[rows])
+            chunks.append((self.graph.features(customer_nodes, merchant_nodes), customer_nodes, merchant_nodes))
+            self.graph.record_fraud(customer_nodes, merchant_nodes, fraud_labels[rows])
+        features = {col: np.concatenate([chunk[0][col] for chunk in chunks]) for col in GRAPH_FEATURES}
+        nodes = (np.concatenate([chunk[1] for chunk in chunks]), np.concatenate([chunk[2] for chunk in chunks]))
+        return features, nodes
+    
+    def _downcast(self, df):
+        """Shrink engineered columns to float32, small integers and categoricals"""
+        for col in df.columns:
+            dtype = df[col].dtype
+            if col in SMALL_INT_FEATURES:
+                df[col] = df[col].astype(SMALL_INT_FEATURES[col])
+            elif isinstance(dtype, np.dtype) and dtype.kind == 'f':
+                df[col] = df[col].astype(np.float32)
+            elif isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif dtype == object:
+                df[col] = df[col].astype('category')
+        return df
+    
+    def _check_memory(self, stage, nbytes):
+        """Enforce the memory ceiling on everything still held plus a stage's bytes"""
+        if self.memory_report is None:
+            self.memory_report = {'stages': [], 'live_bytes': 0, 'peak_bytes': 0,
+                                  'budget_bytes': self.max_memory_bytes}
+        live_bytes = self.memory_report['live_bytes']
+        if self.max_memory_bytes is not None and live_bytes + nbytes > self.max_memory_bytes:
+            raise MemoryError(
+                f"Stage '{stage}' needs {nbytes / 1024 / 1024:.1f} MB on top of the "
+                f"{live_bytes / 1024 / 1024:.1f} MB already held, over the "
+                f"{self.max_memory_bytes / 1024 / 1024:.1f} MB memory budget"
+            )
+    
+    def _record_memory(self, stage, nbytes, rows):
+        """Record a stage that stays referenced for the rest of the pipeline"""
+        self._check_memory(stage, nbytes)
+        report = self.memory_report
+        report['live_bytes'] += int(nbytes)
+        report['peak_bytes'] = max(report['peak_bytes'], report['live_bytes'])
+        report['stages'].append({
+            'stage': stage,
+            'bytes': int(nbytes),
+            'bytes_per_row': round(nbytes / rows, 2) if rows else 0.0,
+            'live_bytes': report['live_bytes']
+        })
+    
+    def _build_scaled_matrix(self, df, fit=False, fraud_labels=None):
+        """Run feature engineering, extraction and scaling, tracking the memory held across stages"""
+        if self.memory_budget:
+            self.memory_report = None
+            self._record_memory('input', df.memory_usage(deep=True).sum(), len(df))
+        
+        df_processed = self.prepare_features(df, fraud_labels)
+        if self.memory_budget:
+            self._record_memory('prepared', df_processed.memory_usage(deep=True).sum(), len(df_processed))
+        
+        trained_features = self.feature_names
+        X = self.extract_feature_matrix(df_processed)
+        
+        # Ensure X has the same columns as training data
+        if not fit and trained_features is not None:
+            self.feature_names = trained_features
+            # Add missing columns with default values
+            for col in self.feature_names:
+                if col not in X.columns:
+                    X[col] = 0
+            # Remove extra columns
+            X = X[self.feature_names]
+        
+        if not self.memory_budget:
+            X_values = self._scaler_input(X)
+            X_scaled = self.scaler.fit_transform(X_values) if fit else self.scaler.transform(X_values)
+            return df_processed, X, X_scaled
+        
+        self._record_memory('feature_matrix', X.memory_usage(deep=True).sum(), len(X))
+        
+        # Scale a single float32 block in place instead of allocating a float64 copy; the
+        # ceiling is checked before the block is allocated
+        self._check_memory('scaled', len(X) * X.shape[1] * np.dtype(np.float32).itemsize)
+        X_values = self._scaler_input(X, np.float32)
+        if fit:
+            self.scaler.fit(X_values)
+        X_scaled = self.scaler.transform(X_values, copy=False)
+        self._record_memory('scaled', X_scaled.nbytes, len(X_scaled))
+        return df_processed, X, X_scaled
+    
+    def _scaler_input(self, X, dtype=None):
+        """Feature frame as the scaler expects it: a fresh array in both memory modes"""
+        if hasattr(self.scaler, 'feature_names_in_'):
+            # Scalers saved by older versions were fitted on the frame itself
+            return X if dtype is None else X.astype(dtype)
+        # Always a copy, so in-place scaling never rewrites the raw feature frame
+        return X.to_numpy(dtype=dtype, copy=True)
+    
     def extract_feature_matrix(self, df):
         """Extract numeric features for modeling"""
         feature_cols = [
@@ -116,30 +305,34 @@ class FraudDetectionModel:
         
         # Add optional columns if they exist
         optional_cols = ['merchant_avg_amount', 'merchant_std_amount', 
-                        'merchant_count', 'amount_deviation', 'transaction_velocity']
+                        'merchant_count', 'amount_deviation', 'transaction_velocity'] + GRAPH_FEATURES
         feature_cols.extend([col for col in optional_cols if col in df.columns])
         
         self.feature_names = feature_cols
         X = df[feature_cols].fillna(0)
+        if self.memory_budget:
+            X = X.astype(np.float32)
         
         return X
     
     def train(self, df, fraud_label_col='is_fraud'):
         """Train fraud detection models"""
-        print("Preparing features...")
-        df_processed = self.prepare_features(df)
+        fraud_labels = None
+        # The training data becomes the graph's history; a graph loaded with a saved
+        # model is dropped when this model isn't configured for graph features
+        self.graph = TransactionGraph() if self.graph_features else None
+        if self.graph_features:
+            if fraud_label_col in df.columns:
+                fraud_labels = pd.to_numeric(df[fraud_label_col], errors='coerce').fillna(0).to_numpy()
         
-        print("Extracting features...")
-        X = self.extract_feature_matrix(df_processed)
+        print("Preparing, extracting and scaling features...")
+        df_processed, X, X_scaled = self._build_scaled_matrix(df, fit=True, fraud_labels=fraud_labels)
         
         if fraud_label_col in df_processed.columns:
             y = pd.to_numeric(df_processed[fraud_label_col], errors='coerce').fillna(0)
         else:
             y = np.zeros(len(df))
         
-        print("Scaling features...")
-        X_scaled = self.scaler.fit_transform(X)
-        
         # Store training data statistics for later use
         self.training_stats = {
             'feature_count': X.shape[1],
@@ -147,6 +340,8 @@ class FraudDetectionModel:
             'fraud_ratio': float(y.mean()) if len(set(y)) > 1 else 0,
             'feature_names': list(X.columns) if hasattr(X, 'columns') else []
         }
+        if self.drift_monitoring:
+            self.drift_monitor = DriftMonitor().fit(X)
         
         if len(set(y)) > 1:  # If we have both classes
             try:
@@ -199,6 +394,12 @@ class FraudDetectionModel:
         )
         self.isolation_forest.fit(X_scaled)
         
+        cascade_stats = None
+        if self.cascade:
+            print("Distilling screening model...")
+            cascade_stats = self._fit_screening_model(X_train, X_test, np.asarray(y_test))
+            print(f"   Screening band: {self.cascade_band}, holdout recall: {cascade_stats['holdout_recall']}")
+        
         # Calculate feature importances
         rf_importance = self.rf_model.feature_importances_ if self.rf_model else np.zeros(X.shape[1])
         xgb_importance = self.xgb_model.feature_importances_ if self.xgb_model else np.zeros(X.shape[1])
@@ -217,82 +418,160 @@ class FraudDetectionModel:
             'xgb_score': float(xgb_score),
             'samples_trained': len(X),
             'fraud_ratio': float(y.mean()) if len(set(y)) > 1 else 0,
-            'feature_importance': feature_importance
+            'feature_importance': feature_importance,
+            'cascade': cascade_stats
         }
     
-    def predict(self, df):
-        """Predict fraud on new data"""
-        # Check if models are trained
-        if self.rf_model is None or self.xgb_model is None or self.isolation_forest is None:
-            raise Exception("Models not trained yet. Please train the model first.")
-        
-        df_processed = self.prepare_features(df)
-        X = self.extract_feature_matrix(df_processed)
-        
-        # Ensure X has the same columns as training data
-        if self.feature_names is not None:
-            # Add missing columns with default values
-            for col in self.feature_names:
-                if col not in X.columns:
-                    X[col] = 0
-            # Remove extra columns
-            X = X[self.feature_names]
+    def _fit_screening_model(self, X_train, X_holdout, y_holdout):
+        """Distill a shallow tree from the ensemble and calibrate its band on the holdout"""
+        ensemble_train = (self._classify(self.rf_model, X_train, 'RF')[1] +
+                          self._classify(self.xgb_model, X_train, 'XGB')[1]) / 2
+        self.screen_model = DecisionTreeRegressor(
+            max_depth=SCREEN_MAX_DEPTH,
+            min_samples_leaf=SCREEN_MIN_SAMPLES_LEAF,
+            random_state=42
+        )
+        self.screen_model.fit(X_train, ensemble_train)
         
-        X_scaled = self.scaler.transform(X)
+        screen_score = self.screen_model.predict(X_holdout)
+        ensemble_pred = ((self._classify(self.rf_model, X_holdout, 'RF')[1] +
+                          self._classify(self.xgb_model, X_holdout, 'XGB')[1]) / 2) > 0.5
+        configured_low, high = self.cascade_band_config
+        positives = y_holdout == 1
+        n_positives = int(positives.sum())
         
-        # Ensemble predictions with error handling
-        try:
-            rf_pred = self.rf_model.predict(X_scaled)
-            # Handle case where predict_proba might return single column
-            rf_proba_full = self.rf_model.predict_proba(X_scaled)
-            if rf_proba_full.shape[1] > 1:
-                rf_proba = rf_proba_full[:, 1]
-            else:
-                # If only one class was predicted during training, use the single column
-                rf_proba = np.full(len(X_scaled), 0.5)  # Default to 0.5 probability
-        except Exception as e:
-            print(f"RF prediction error: {str(e)}")
-            rf_pred = np.zeros(len(X_scaled))
-            rf_proba = np.full(len(X_scaled), 0.5)
+        # A fraud stays caught if the screen flags it, or if it reaches the ensemble and the ensemble flags it
+        caught_scores = np.sort(screen_score[positives & ((screen_score > high) | ensemble_pred)])[::-1]
+        ensemble_recall = len(caught_scores) / n_positives if n_positives else 0.0
+        if n_positives == 0:
+            # Nothing to measure recall on, so everything goes to the ensemble
+            low = 0.0
+        else:
+            # Largest lower bound that keeps enough caught frauds (capped at what the ensemble achieves)
+            needed = min(int(np.ceil(self.recall_floor * n_positives)), len(caught_scores))
+            low = float(caught_scores[needed - 1]) if needed > 0 else high
+        if configured_low is not None:
+            low = min(low, configured_low)
+        low = min(low, high)
+        self.cascade_band = (float(low), float(high))
         
+        in_band = (screen_score >= low) & (screen_score <= high)
+        cascade_pred = (screen_score > high) | (in_band & ensemble_pred)
+        return {
+            'band': list(self.cascade_band),
+            'recall_floor': self.recall_floor,
+            'holdout_positives': n_positives,
+            'holdout_recall': round(float((cascade_pred & positives).sum() / n_positives), 4) if n_positives else None,
+            'ensemble_holdout_recall': round(float(ensemble_recall), 4) if n_positives else None,
+            'holdout_pass_through_rate': round(float(in_band.mean()), 4) if len(in_band) else 0.0
+        }
+    
+    def _classify(self, model, X_scaled, name):
+        """Return class predictions and fraud probabilities from one classifier"""
         try:
-            xgb_pred = self.xgb_model.predict(X_scaled)
-            # Handle case where predict_proba might return single column
-            xgb_proba_full = self.xgb_model.predict_proba(X_scaled)
-            if xgb_proba_full.shape[1] > 1:
-                xgb_proba = xgb_proba_full[:, 1]
+            proba_full = model.predict_proba(X_scaled)
+            # Derive labels from the probabilities instead of a second predict() pass
+            pred = model.classes_[np.argmax(proba_full, axis=1)]
+            if proba_full.shape[1] > 1:
+                proba = proba_full[:, 1]
             else:
                 # If only one class was predicted during training, use the single column
-                xgb_proba = np.full(len(X_scaled), 0.5)  # Default to 0.5 probability
+                proba = np.full(len(X_scaled), 0.5)  # Default to 0.5 probability
         except Exception as e:
-            print(f"XGB prediction error: {str(e)}")
-            xgb_pred = np.zeros(len(X_scaled))
-            xgb_proba = np.full(len(X_scaled), 0.5)
+            print(f"{name} prediction error: {str(e)}")
+            pred = np.zeros(len(X_scaled))
+            proba = np.full(len(X_scaled), 0.5)
+        return pred, proba
+    
+    def _score_models(self, X_scaled):
+        """Score a scaled feature matrix with every model in the ensemble"""
+        rf_pred, rf_proba = self._classify(self.rf_model, X_scaled, 'RF')
+        xgb_pred, xgb_proba = self._classify(self.xgb_model, X_scaled, 'XGB')
         
         # Anomaly detection
         try:
-            anomaly_pred = self.isolation_forest.predict(X_scaled)
             anomaly_score = -self.isolation_forest.score_samples(X_scaled)
+            # Same decision as IsolationForest.predict without scoring twice
+            anomaly_pred = np.where(-anomaly_score < self.isolation_forest.offset_, -1, 1)
         except Exception as e:
             print(f"Anomaly detection error: {str(e)}")
             anomaly_pred = np.ones(len(X_scaled))
             anomaly_score = np.zeros(len(X_scaled))
+        
+        return {
+            'rf_pred': rf_pred,
+            'rf_proba': rf_proba,
+            'xgb_pred': xgb_pred,
+            'xgb_proba': xgb_proba,
+            'anomaly_pred': anomaly_pred,
+            'anomaly_score': anomaly_score
+        }
+    
+    def predict(self, df):
+        """Predict fraud on new data"""
+        # Check if models are trained
+        if self.rf_model is None or self.xgb_model is None or self.isolation_forest is None:
+            raise Exception("Models not trained yet. Please train the model first.")
+        
+        df_processed, X, X_scaled = self._build_scaled_matrix(df)
+        if self.drift_monitor is not None:
+            self.drift_monitor.update(X)
+        # Challengers score the same feature matrix in background threads
+        pending_challengers = self.challengers.submit(self, df_processed, X) if len(self.challengers) else None
+        
+        n_rows = len(X_scaled)
+        rf_proba = np.zeros(n_rows)
+        xgb_proba = np.zeros(n_rows)
+        anomaly_pred = np.ones(n_rows)
+        anomaly_score = np.zeros(n_rows)
+        cascade_stage = np.full(n_rows, 'ensemble', dtype=object)
+        fixed_decisions = None
+        
+        # Cascade: a cheap screening model decides rows outside the uncertainty band
+        if self.cascade and self.screen_model is not None:
+            screen_score = self.screen_model.predict(X_scaled)
+            screen_low, screen_high = self.cascade_band
+            in_band = (screen_score >= screen_low) & (screen_score <= screen_high)
+            screened = ~in_band
+            rf_proba[screened] = screen_score[screened]
+            xgb_proba[screened] = screen_score[screened]
+            fixed_decisions = np.where(screened, (screen_score > screen_high).astype(np.int8), -1)
+            cascade_stage[screened] = 'screen'
+            self.cascade_stats = {
+                'rows': int(n_rows),
+                'screened_legit': int((screen_score < screen_low).sum()),
+                'screened_fraud': int((screen_score > screen_high).sum()),
+                'ensemble_rows': int(in_band.sum()),
+                'ensemble_pass_through_rate': float(in_band.mean()) if n_rows else 0.0
+            }
+        else:
+            in_band = np.ones(n_rows, dtype=bool)
+        
+        # Full ensemble on the rows that need it
+        if in_band.any():
+            scores = self._score_models(X_scaled if in_band.all() else X_scaled[in_band])
+            rf_proba[in_band] = scores['rf_proba']
+            xgb_proba[in_band] = scores['xgb_proba']
+            anomaly_pred[in_band] = scores['anomaly_pred']
+            anomaly_score[in_band] = scores['anomaly_score']
 
-        # Ensemble voting with weighted average based on model performance
-        ensemble_proba = (rf_proba + xgb_proba) / 2
-        ensemble_pred = (ensemble_proba > 0.5).astype(int)
+        # Ensemble voting with weighted average; screened rows keep the screening decision
         iso_vote = (anomaly_pred == -1).astype(int)
+        decided = self.policy.apply(rf_proba, xgb_proba, iso_vote, fixed_decisions)
+        ensemble_proba = decided['ensemble_proba']
+        ensemble_pred = decided['decisions']
+        rf_pred, xgb_pred = decided['rf_votes'], decided['xgb_votes']
+        if pending_challengers is not None:
+            self.challengers.collect(pending_challengers, ensemble_proba, ensemble_pred, self.policy.threshold)
 
         # Normalize anomaly score to 0-1 range for display
-        if len(anomaly_score) > 0:
-            iso_min = anomaly_score.min()
-            iso_range = anomaly_score.max() - iso_min
-            if iso_range == 0:
-                iso_norm = np.zeros_like(anomaly_score)
-            else:
-                iso_norm = (anomaly_score - iso_min) / iso_range
-        else:
-            iso_norm = np.zeros_like(anomaly_score)
+        iso_norm = np.zeros_like(anomaly_score)
+        if in_band.any():
+            scored = anomaly_score[in_band]
+            iso_min = scored.min()
+            iso_range = scored.max() - iso_min
+            if iso_range != 0:
+                iso_norm[in_band] = (scored - iso_min) / iso_range
 
         results_df = df.copy()
         results_df['rf_fraud_probability'] = rf_proba
@@ -302,12 +581,10 @@ class FraudDetectionModel:
         results_df['anomaly_score'] = anomaly_score
         results_df['is_anomaly'] = iso_vote
         results_df['iso_fraud_probability'] = iso_norm
-        results_df['risk_level'] = results_df['ensemble_fraud_probability'].apply(
-            lambda x: 'Critical' if x > 0.7 else ('High' if x > 0.5 else ('Medium' if x > 0.3 else 'Low'))
-        )
+        results_df['risk_level'] = RISK_LABELS[decided['risk_codes']]
 
         # Add confidence score
-        results_df['confidence_score'] = np.abs(ensemble_proba - 0.5) * 2
+        results_df['confidence_score'] = decided['confidence']
 
         # Store per-model decision labels for frontend explainability
         results_df['rf_prediction'] = np.where(rf_pred == 1, 'Fraud', 'Normal')
@@ -315,20 +592,46 @@ class FraudDetectionModel:
         results_df['iso_prediction'] = np.where(iso_vote == 1, 'Fraud', 'Normal')
         results_df['final_decision_label'] = np.where(ensemble_pred == 1, 'Fraud', 'Normal')
 
-        agreement_state = []
-        for rf_vote, xgb_vote, iso_result in zip(rf_pred, xgb_pred, iso_vote):
-            unique_votes = len({int(rf_vote), int(xgb_vote), int(iso_result)})
-            if unique_votes == 1:
-                agreement_state.append('unanimous')
-            elif unique_votes == 2:
-                agreement_state.append('majority')
-            else:
-                agreement_state.append('split')
-
-        results_df['agreement_state'] = agreement_state
+        results_df['agreement_state'] = AGREEMENT_LABELS[decided['agreement_codes']]
+        
+        # Per-transaction reason codes for risky rows only
+        if self.reason_threshold is not None:
+            explain_rows = np.flatnonzero(ensemble_proba > self.reason_threshold)
+            reasons = self.explain(X_scaled[explain_rows], X.to_numpy()[explain_rows]) if len(explain_rows) else []
+            results_df['reason_codes'] = ReasonCodes.to_column(reasons, n_rows, explain_rows)
+        # Scored frauds feed the graph's fraud counts
+        if self._graph_nodes is not None:
+            self.graph.record_fraud(*self._graph_nodes, ensemble_pred)
+        
+        # Kept so that other rows of this run can be explained on request
+        self.last_features = (X, X_scaled)
+        if self.cascade and self.screen_model is not None:
+            results_df['cascade_stage'] = cascade_stage
 
         return results_df
     
+    def warm_up(self, df):
+        """Score a synthetic batch so the first real request doesn't pay one-time initialization costs"""
+        saved = {name: getattr(self, name) for name in WARM_UP_PRESERVED}
+        saved_encoders = dict(self.label_encoders)
+        self.drift_monitor = None
+        self.challengers = ChallengerPool()
+        if self.graph is not None:
+            self.graph = TransactionGraph()
+        try:
+            self.predict(df)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+            self.label_encoders = saved_encoders
+    
+    def explain(self, X_scaled, X_raw, top_k=None):
+        """Top-k reason codes for rows of a scaled feature matrix"""
+        return ReasonCodes.explain(
+            self.rf_model, self.xgb_model, X_scaled, X_raw,
+            self.feature_names, top_k or self.reason_top_k
+        )
+    
     def save(self, path='models'):
         """Save trained models"""
         os.makedirs(path, exist_ok=True)
@@ -338,6 +641,14 @@ class FraudDetectionModel:
         joblib.dump(self.scaler, f'{path}/scaler.pkl')
         joblib.dump(self.label_encoders, f'{path}/encoders.pkl')
         joblib.dump(self.feature_names, f'{path}/features.pkl')
+        if self.graph is not None:
+            joblib.dump(self.graph, f'{path}/graph.pkl')
+        if self.drift_monitor is not None:
+            joblib.dump(self.drift_monitor, f'{path}/drift.pkl')
+        if self.screen_model is not None:
+            joblib.dump(self.screen_model, f'{path}/screen_model.pkl')
+            joblib.dump({'band': self.cascade_band, 'recall_floor': self.recall_floor},
+                        f'{path}/cascade.pkl')
         print(f"Models saved to {path}")
     
     def load(self, path='models'):
@@ -349,6 +660,18 @@ class FraudDetectionModel:
             self.scaler = joblib.load(f'{path}/scaler.pkl')
             self.label_encoders = joblib.load(f'{path}/encoders.pkl')
             self.feature_names = joblib.load(f'{path}/features.pkl')
+            # Graph index is optional (only saved when trained with graph features)
+            self.graph = joblib.load(f'{path}/graph.pkl') if os.path.exists(f'{path}/graph.pkl') else None
+            self.drift_monitor = joblib.load(f'{path}/drift.pkl') if os.path.exists(f'{path}/drift.pkl') else None
+            # Screening model is optional (only saved when trained in cascade mode)
+            if os.path.exists(f'{path}/screen_model.pkl'):
+                self.screen_model = joblib.load(f'{path}/screen_model.pkl')
+                cascade_config = joblib.load(f'{path}/cascade.pkl')
+                self.cascade_band = cascade_config['band']
+                self.recall_floor = cascade_config['recall_floor']
+            else:
+                self.screen_model = None
+                self.cascade_band = None
             print(f"Models loaded from {path}")
         except Exception as e:
             print(f"Could not load models: {str(e)}")
\ No newline at end of file
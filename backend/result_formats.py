@@ -0,0 +1,161 @@
+import io
+import json
+import zlib
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STREAM_CHUNK_BYTES = 1024 * 1024
+ARROW_BATCH_ROWS = 64 * 1024
+
+FORMAT_MIMETYPES = {
+    'json': 'application/json',
+    'columnar': 'application/json',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+FORMAT_EXTENSIONS = {
+    'columnar': 'json',
+    'csv': 'csv',
+    'arrow': 'arrows',
+    'parquet': 'parquet',
+}
+
+# Formats that are already compressed internally
+PRECOMPRESSED_FORMATS = {'parquet'}
+
+class ResultFormatter:
+    @staticmethod
+    def available_formats():
+        """List result formats supported by the installed libraries"""
+        formats = ['json', 'columnar', 'csv']
+        if pa is not None:
+            formats.extend(['arrow', 'parquet'])
+        return formats
+
+    @staticmethod
+    def available_encodings():
+        """List transfer encodings in order of preference"""
+        return (['zstd'] if zstandard is not None else []) + ['gzip']
+
+    @staticmethod
+    def negotiate_format(requested, accept_mimetypes, default='json'):
+        """Pick a format from an explicit ?format= value or the Accept header"""
+        available = ResultFormatter.available_formats()
+        if requested:
+            requested = requested.lower()
+            return requested if requested in available else None
+
+        # The default goes first so that */* and missing headers resolve to it
+        candidates = [default] + [fmt for fmt in ['arrow', 'parquet', 'csv'] if fmt in available and fmt != default]
+        by_mimetype = {}
+        for fmt in candidates:
+            by_mimetype.setdefault(FORMAT_MIMETYPES[fmt], fmt)
+        best = accept_mimetypes.best_match(list(by_mimetype), default=FORMAT_MIMETYPES[default])
+        return by_mimetype.get(best, default)
+
+    @staticmethod
+    def negotiate_encoding(accept_encodings, fmt):
+        """Pick a streaming compression from the Accept-Encoding header"""
+        if fmt in PRECOMPRESSED_FORMATS:
+            return None
+        return accept_encodings.best_match(ResultFormatter.available_encodings())
+
+    @staticmethod
+    def iter_encoded(df, fmt):
+        """Serialize a results frame as a stream of byte chunks"""
+        if fmt == 'columnar':
+            yield ResultFormatter.columnar_json(df)
+        elif fmt == 'csv':
+            # Encode in row slices so the whole CSV text is never held at once
+            for start in range(0, max(len(df), 1), ARROW_BATCH_ROWS):
+                yield df.iloc[start:start + ARROW_BATCH_ROWS].to_csv(
+                    index=False, header=(start == 0)
+                ).encode('utf-8')
+        elif fmt == 'arrow':
+            yield from ResultFormatter._iter_arrow_ipc(df)
+        elif fmt == 'parquet':
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index=False, compression='zstd')
+            view = buffer.getbuffer()
+            for start in range(0, len(view), STREAM_CHUNK_BYTES):
+                yield bytes(view[start:start + STREAM_CHUNK_BYTES])
+        else:
+            raise ValueError(f"Unsupported result format: {fmt}")
+
+    @staticmethod
+    def iter_file(filepath):
+        """Read a file from disk as a stream of byte chunks"""
+        with open(filepath, 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+    @staticmethod
+    def compress(chunks, encoding):
+        """Compress a stream of byte chunks with gzip or zstd"""
+        if encoding is None:
+            yield from chunks
+            return
+        if encoding == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=3, threads=-1).compressobj()
+        elif encoding == 'gzip':
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def columnar_json(df):
+        """Encode a frame as column-oriented JSON"""
+        data = {}
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = series.astype(str)
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf' and orjson is not None:
+                # orjson serializes numeric arrays natively and writes NaN as null
+                data[str(col)] = series.to_numpy()
+            else:
+                data[str(col)] = series.astype(object).where(series.notna(), None).tolist()
+        payload = {'columns': [str(col) for col in df.columns], 'rows': len(df), 'data': data}
+        if orjson is not None:
+            return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(payload).encode('utf-8')
+
+    @staticmethod
+    def _iter_arrow_ipc(df):
+        """Write an Arrow IPC stream one record batch at a time"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+                writer.write_batch(batch)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        # End-of-stream marker written on close
+        yield sink.getvalue()
@@ -0,0 +1,87 @@
+import sys
+import os
+import tempfile
+import pandas as pd
+import numpy as np
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data_generator import TransactionGenerator
+from data_processor import DataProcessor
+
+def test_generator_output():
+    """Test that generated chunks are reproducible, ordered and contain every fraud pattern"""
+    print("Testing synthetic data generator...")
+    
+    generator = TransactionGenerator(n_customers=2000, n_merchants=200, days=30, fraud_rate=0.02)
+    df = generator.generate(20000, chunk_rows=5000)
+    
+    assert len(df) == 20000
+    assert df['timestamp'].is_monotonic_increasing
+    assert set(df['fraud_pattern'].unique()) == {'', 'spike', 'burst', 'ring'}
+    assert (df['is_fraud'] == (df['fraud_pattern'] != '').astype(int)).all()
+    assert df['customer_id'].between(1000, 1000 + 2000 - 1).all()
+    
+    # Same seed, same data regardless of how it is produced
+    again = TransactionGenerator(n_customers=2000, n_merchants=200, days=30, fraud_rate=0.02)
+    assert df.equals(again.generate(20000, chunk_rows=5000))
+    
+    print("Synthetic data generator test passed!")
+    print(f"   - Fraud patterns: {df['fraud_pattern'].value_counts().to_dict()}")
+
+def test_generator_parallel_write():
+    """Test that parallel writes match in-memory generation"""
+    print("\nTesting parallel generator writes...")
+    
+    generator = TransactionGenerator(n_customers=2000, n_merchants=200, days=30)
+    expected = generator.generate(9000, chunk_rows=3000)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, 'transactions.csv')
+        result = generator.write(csv_path, 9000, workers=2, chunk_rows=3000)
+        assert result['chunks'] == 3
+        written = DataProcessor.read_transactions(csv_path)
+        assert len(written) == 9000
+        assert np.allclose(written['amount'], expected['amount'])
+        assert (written['customer_id'].to_numpy() == expected['customer_id'].to_numpy()).all()
+        
+        parquet_path = os.path.join(tmpdir, 'transactions.parquet')
+        try:
+            generator.write(parquet_path, 9000, workers=2, chunk_rows=3000)
+            assert len(pd.read_parquet(parquet_path)) == 9000
+        except ValueError:
+            pass  # pyarrow not installed
+    
+    print("Parallel generator writes test passed!")
+
+def test_generator_small_chunks():
+    """Test that tiny chunks with a high fraud rate stay valid and keep the requested rate"""
+    print("\nTesting generator with small chunks...")
+    
+    df = TransactionGenerator(n_customers=100, n_merchants=20, fraud_rate=0.2).generate(20, chunk_rows=10)
+    assert len(df) == 20
+    
+    for n_rows in range(1, 40):
+        df = TransactionGenerator(n_customers=50, n_merchants=10, fraud_rate=1.0).generate(n_rows, chunk_rows=7)
+        assert df['is_fraud'].all()
+        assert df['timestamp'].is_monotonic_increasing
+    
+    # The realized fraud rate doesn't depend on the chunk size
+    for chunk_rows in (100, 1000):
+        df = TransactionGenerator(fraud_rate=0.01).generate(100000, chunk_rows=chunk_rows)
+        assert abs(df['is_fraud'].mean() - 0.01) < 0.002, df['is_fraud'].mean()
+        assert df['timestamp'].is_monotonic_increasing
+    
+    print("Small chunks test passed!")
+
+if __name__ == "__main__":
+    try:
+        test_generator_output()
+        test_generator_parallel_write()
+        test_generator_small_chunks()
+        
+        print("\nAll data generator tests passed successfully!")
+        
+    except Exception as e:
+        print(f"\nData generator test failed with error: {str(e)}")
+        sys.exit(1)
@@ -1,5 +1,6 @@
 import sys
 import os
+import tempfile
 import pandas as pd
 import numpy as np
 
@@ -70,6 +71,57 @@ def test_statistics_calculation(df):
     
     return stats
 
+def test_schema_ingestion():
+    """Test that CSVs are validated from a sample and parsed with the declared schema"""
+    print("\nTesting schema-driven ingestion...")
+    
+    df = DataProcessor.generate_sample_data(200)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, 'transactions.csv')
+        df.to_csv(filepath, index=False)
+        
+        # Validation only parses the header and sample rows
+        result = DataProcessor.validate_csv_file(filepath)
+        assert result['success'], result.get('error')
+        assert result['rows'] == 200, f"Expected 200 rows, got {result['rows']}"
+        assert len(result['sample']) == 3
+        assert result['columns'] == list(df.columns)
+        
+        parsed = DataProcessor.read_transactions(filepath)
+        assert len(parsed) == 200
+        assert str(parsed['merchant_category'].dtype) == 'category'
+        assert pd.api.types.is_datetime64_any_dtype(parsed['timestamp'])
+        assert not (parsed.dtypes == object).any(), "Schema columns should not be object dtype"
+        
+        # usecols restricts parsing to the requested columns
+        subset = DataProcessor.read_transactions(filepath, usecols=['amount', 'timestamp'])
+        assert list(subset.columns) == ['amount', 'timestamp']
+        
+        # Ids that don't fit the declared dtype fall back to inference
+        df['customer_id'] = 'C' + df['customer_id'].astype(str)
+        df.to_csv(filepath, index=False)
+        parsed = DataProcessor.read_transactions(filepath)
+        assert parsed['customer_id'].iloc[0].startswith('C')
+        
+        # Timestamps that aren't ISO8601 still parse, through format inference
+        df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%m/%d/%Y %H:%M')
+        df.to_csv(filepath, index=False)
+        parsed = DataProcessor.read_transactions(filepath)
+        assert parsed['timestamp'].notna().all(), "Non-ISO timestamps became NaT"
+        assert (parsed['timestamp'].dt.strftime('%m/%d/%Y %H:%M') == df['timestamp']).all()
+        
+        # Row counts follow the CSV grammar, not raw newlines
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('amount,note\n1,"two\nlines"\n\n2,plain\n\n')
+        assert DataProcessor.count_rows(filepath) == len(pd.read_csv(filepath)) == 2
+        
+        # Invalid bytes are caught anywhere in the file, not only near the start
+        with open(filepath, 'wb') as f:
+            f.write(b'amount,note\n' + b'1,ok\n' * 50000 + b'2,\xff\n')
+        assert not DataProcessor.is_utf8(filepath)
+    
+    print("Schema ingestion test passed!")
+
 if __name__ == "__main__":
     try:
         # Test sample data generation
@@ -78,6 +130,9 @@ if __name__ == "__main__":
         # Test statistics calculation
         stats = test_statistics_calculation(df)
         
+        # Test schema-driven ingestion
+        test_schema_ingestion()
+        
         print("\nAll tests passed successfully!")
         
     except Exception as e:
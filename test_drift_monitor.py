@@ -0,0 +1,67 @@
+import sys
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data_processor import DataProcessor
+from drift_monitor import DriftMonitor
+from ml_models import FraudDetectionModel
+
+def test_drift_scores():
+    """Test that PSI and KS flag shifted features and ignore stable ones"""
+    print("Testing drift scores...")
+    
+    rng = np.random.default_rng(0)
+    baseline = pd.DataFrame({'amount': rng.exponential(50, 5000), 'hour': rng.integers(0, 24, 5000)})
+    monitor = DriftMonitor().fit(baseline)
+    
+    # Same distribution in the morning window, shifted amounts in the afternoon window
+    morning, afternoon = datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 15, 40)
+    for _ in range(3):
+        monitor.update(pd.DataFrame({'amount': rng.exponential(50, 1000), 'hour': rng.integers(0, 24, 1000)}), morning)
+    monitor.update(pd.DataFrame({'amount': rng.exponential(50, 1000) + 200, 'hour': rng.integers(0, 24, 1000)}), afternoon)
+    
+    stable = monitor.report('2024-01-01T09:00:00')
+    assert stable['rows'] == 3000
+    assert stable['drifted_features'] == []
+    
+    shifted = monitor.report('2024-01-01T15:00:00')
+    assert shifted['features']['amount']['status'] == 'significant'
+    assert shifted['features']['amount']['ks'] > 0.5
+    assert shifted['features']['hour']['status'] == 'stable'
+    
+    overall = monitor.report()
+    assert overall['rows'] == 4000
+    assert monitor.report('2023-01-01T00:00:00') is None
+    
+    print("Drift scores test passed!")
+    print(f"   - Shifted amount PSI: {shifted['features']['amount']['psi']}")
+
+def test_drift_monitor_in_model():
+    """Test that training builds the baseline and scoring updates it"""
+    print("\nTesting drift monitor in the model...")
+    
+    df = DataProcessor.generate_sample_data(500)
+    fraud_model = FraudDetectionModel()
+    fraud_model.train(df, 'is_fraud')
+    assert fraud_model.drift_monitor.feature_names == fraud_model.feature_names
+    
+    fraud_model.predict(df.head(200))
+    assert fraud_model.drift_monitor.report()['rows'] == 200
+    
+    print("Drift monitor in model test passed!")
+
+if __name__ == "__main__":
+    try:
+        test_drift_scores()
+        test_drift_monitor_in_model()
+        
+        print("\nAll drift monitor tests passed successfully!")
+        
+    except Exception as e:
+        print(f"\nDrift monitor test failed with error: {str(e)}")
+        sys.exit(1)
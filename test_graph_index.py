@@ -0,0 +1,116 @@
+import sys
+import os
+from collections import Counter
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data_processor import DataProcessor
+from graph_index import TransactionGraph, GRAPH_FEATURES
+from ml_models import FraudDetectionModel
+
+def test_incremental_components():
+    """Test that incremental union-find matches a full connected-components pass"""
+    print("Testing incremental graph components...")
+    
+    rng = np.random.default_rng(1)
+    graph = TransactionGraph()
+    customers, merchants, frauds = [], [], []
+    for _ in range(20):
+        batch_customers = rng.integers(0, 5000, 300)
+        batch_merchants = rng.integers(0, 5000, 300)
+        batch_fraud = (rng.random(300) < 0.05).astype(int)
+        graph.add_transactions(batch_customers, batch_merchants, batch_fraud)
+        customers.append(batch_customers)
+        merchants.append(batch_merchants)
+        frauds.append(batch_fraud)
+    customers, merchants, frauds = np.concatenate(customers), np.concatenate(merchants), np.concatenate(frauds)
+    
+    # Reference components over customers 0..4999 and merchants 5000..9999
+    adjacency = sp.coo_matrix(
+        (np.ones(len(customers)), (customers, 5000 + merchants)), shape=(10000, 10000)
+    )
+    _, labels = connected_components(adjacency, directed=False)
+    used = np.unique(np.concatenate([customers, 5000 + merchants]))
+    assert graph.n_components == len(np.unique(labels[used]))
+    
+    features = graph.features(graph._nodes('customer', customers, create=False),
+                              graph._nodes('merchant', merchants, create=False))
+    component_sizes = Counter(labels[used])
+    component_frauds = Counter(labels[customers][frauds == 1])
+    assert (features['component_size'] == [component_sizes[l] for l in labels[customers]]).all()
+    assert (features['component_fraud_count'] == [component_frauds[l] for l in labels[customers]]).all()
+    assert graph.summary()['edges'] == len(set(zip(customers.tolist(), merchants.tolist())))
+    
+    subgraph = graph.subgraph('customer', int(customers[0]), depth=1)
+    assert subgraph['center'] == f'customer:{customers[0]}'
+    assert len(subgraph['nodes']) == graph.degree[graph.node_index[('customer', int(customers[0]))]] + 1
+    assert graph.subgraph('customer', -1) is None
+    
+    print("Incremental graph components test passed!")
+    print(f"   - Components: {graph.n_components}")
+
+def test_graph_features():
+    """Test that graph features reach the model without leaking training labels"""
+    print("\nTesting graph features in the model...")
+    
+    df = DataProcessor.generate_sample_data(1000)
+    fraud_model = FraudDetectionModel(graph_features=True)
+    training_stats = fraud_model.train(df, 'is_fraud')
+    
+    for col in GRAPH_FEATURES:
+        assert col in fraud_model.feature_names, f"Missing graph feature: {col}"
+    # A leaked label would dominate the importances
+    assert training_stats['feature_importance']['component_fraud_count'] < 0.2
+    assert fraud_model.graph.summary()['fraud_transactions'] == int(df['is_fraud'].sum())
+    
+    predictions = fraud_model.predict(df.head(100))
+    assert fraud_model.graph.summary()['fraud_transactions'] == \
+        int(df['is_fraud'].sum()) + int(predictions['is_fraud_predicted'].sum())
+    
+    # Retraining without graph features drops a graph that came with a loaded model
+    plain_model = FraudDetectionModel()
+    plain_model.graph = fraud_model.graph
+    plain_model.train(df, 'is_fraud')
+    assert plain_model.graph is None
+    assert not any(col in plain_model.feature_names for col in GRAPH_FEATURES)
+    
+    print("Graph features test passed!")
+
+def test_graph_string_ids():
+    """Test that non-numeric customer and merchant ids get their own graph nodes"""
+    print("\nTesting graph with string ids...")
+    
+    df = DataProcessor.generate_sample_data(1000)
+    numeric_model = FraudDetectionModel(graph_features=True)
+    numeric_model.train(df, 'is_fraud')
+    
+    df['customer_id'] = 'C' + df['customer_id'].astype(str)
+    df['merchant_id'] = 'M' + df['merchant_id'].astype(str)
+    string_model = FraudDetectionModel(graph_features=True)
+    string_model.train(df, 'is_fraud')
+    
+    # Same transactions, same graph; only the ids differ
+    assert string_model.graph.summary() == numeric_model.graph.summary()
+    assert string_model.graph.summary()['customers'] == df['customer_id'].nunique()
+    
+    customer_id = df['customer_id'].iloc[0]
+    subgraph = string_model.graph.subgraph('customer', customer_id, depth=1)
+    assert subgraph['center'] == f'customer:{customer_id}'
+    
+    print("Graph string ids test passed!")
+
+if __name__ == "__main__":
+    try:
+        test_incremental_components()
+        test_graph_features()
+        test_graph_string_ids()
+        
+        print("\nAll graph index tests passed successfully!")
+        
+    except Exception as e:
+        print(f"\nGraph index test failed with error: {str(e)}")
+        sys.exit(1)
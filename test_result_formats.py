@@ -0,0 +1,56 @@
+import sys
+import os
+import io
+import gzip
+import json
+import pandas as pd
+import numpy as np
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data_processor import DataProcessor
+from result_formats import ResultFormatter
+
+def test_result_formats():
+    """Test that results round-trip through every supported format"""
+    print("Testing result formats...")
+    
+    df = DataProcessor.generate_sample_data(300)
+    df['ensemble_fraud_probability'] = np.random.uniform(0, 1, len(df))
+    df.loc[0, 'ensemble_fraud_probability'] = np.nan
+    
+    # Column-oriented JSON keeps every row and writes NaN as null
+    payload = json.loads(b''.join(ResultFormatter.iter_encoded(df, 'columnar')))
+    assert payload['rows'] == len(df)
+    assert payload['columns'] == list(df.columns)
+    assert payload['data']['ensemble_fraud_probability'][0] is None
+    assert payload['data']['timestamp'][0] == str(df['timestamp'].iloc[0])
+    
+    # Streaming compression round-trips
+    csv_bytes = b''.join(ResultFormatter.iter_encoded(df, 'csv'))
+    compressed = b''.join(ResultFormatter.compress(ResultFormatter.iter_encoded(df, 'csv'), 'gzip'))
+    assert gzip.decompress(compressed) == csv_bytes
+    assert len(pd.read_csv(io.BytesIO(csv_bytes))) == len(df)
+    
+    if 'arrow' in ResultFormatter.available_formats():
+        import pyarrow as pa
+        import pyarrow.ipc
+        table = pa.ipc.open_stream(b''.join(ResultFormatter.iter_encoded(df, 'arrow'))).read_all()
+        assert table.num_rows == len(df)
+        parquet_df = pd.read_parquet(io.BytesIO(b''.join(ResultFormatter.iter_encoded(df, 'parquet'))))
+        assert len(parquet_df) == len(df)
+    
+    print("Result formats test passed!")
+    print(f"   - Formats: {ResultFormatter.available_formats()}")
+    print(f"   - Encodings: {ResultFormatter.available_encodings()}")
+
+if __name__ == "__main__":
+    try:
+        test_result_formats()
+        
+        print("\nAll result format tests passed successfully!")
+        
+    except Exception as e:
+        print(f"\nResult format test failed with error: {str(e)}")
+        sys.exit(1)
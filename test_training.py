@@ -58,11 +58,278 @@ def test_model_training():
         traceback.print_exc()
         raise
 
+def test_memory_budget_mode():
+    """Test that memory-budget mode shrinks the pipeline without changing predictions"""
+    print("\nTesting memory-budget mode...")
+    
+    df = DataProcessor.generate_sample_data(500)
+    
+    baseline_model = FraudDetectionModel()
+    baseline_model.train(df, 'is_fraud')
+    budget_model = FraudDetectionModel(memory_budget=True)
+    budget_model.train(df, 'is_fraud')
+    
+    baseline = baseline_model.predict(df)
+    budget = budget_model.predict(df)
+    
+    # Outputs stay equivalent within tolerance
+    max_diff = np.abs(baseline['ensemble_fraud_probability'] - budget['ensemble_fraud_probability']).max()
+    assert max_diff < 0.05, f"Ensemble probabilities drifted by {max_diff}"
+    agreement = (baseline['is_fraud_predicted'] == budget['is_fraud_predicted']).mean()
+    assert agreement > 0.99, f"Decisions agree on only {agreement:.2%} of rows"
+    
+    report = budget_model.memory_report
+    stages = [stage['stage'] for stage in report['stages']]
+    assert stages == ['input', 'prepared', 'feature_matrix', 'scaled'], stages
+    assert report['stages'][-1]['bytes_per_row'] == 4 * len(budget_model.feature_names)
+    # Every stage is still held at the end, so the peak is their sum
+    assert report['peak_bytes'] == sum(stage['bytes'] for stage in report['stages'])
+    
+    # The ceiling is enforced
+    capped_model = FraudDetectionModel(max_memory_mb=0.01)
+    try:
+        capped_model.train(df, 'is_fraud')
+        assert False, "Expected the memory budget to be exceeded"
+    except MemoryError:
+        pass
+    
+    # ... on the combined total, before the scaled matrix is allocated
+    scaled_bytes = report['stages'][-1]['bytes']
+    capped_model = FraudDetectionModel(max_memory_mb=(report['peak_bytes'] - scaled_bytes / 2) / 1024 / 1024)
+    assert all(stage['bytes'] < capped_model.max_memory_bytes for stage in report['stages'])
+    try:
+        capped_model.train(df, 'is_fraud')
+        assert False, "Expected the combined stages to exceed the memory budget"
+    except MemoryError:
+        pass
+    assert [stage['stage'] for stage in capped_model.memory_report['stages']] == ['input', 'prepared', 'feature_matrix']
+    
+    print("Memory-budget mode test passed!")
+    print(f"   - Max probability difference: {max_diff:.4f}")
+    print(f"   - Scaled bytes per row: {report['stages'][-1]['bytes_per_row']}")
+
+def test_cascade_scoring():
+    """Test that cascade mode screens rows while keeping holdout recall above the floor"""
+    print("\nTesting cascade scoring...")
+    
+    df = DataProcessor.generate_sample_data(2000)
+    
+    fraud_model = FraudDetectionModel(cascade=True, recall_floor=0.9)
+    training_stats = fraud_model.train(df, 'is_fraud')
+    cascade = training_stats['cascade']
+    assert cascade['holdout_recall'] >= min(0.9, cascade['ensemble_holdout_recall'])
+    
+    predictions = fraud_model.predict(df)
+    stats = fraud_model.cascade_stats
+    assert stats['rows'] == len(df)
+    assert stats['screened_legit'] + stats['screened_fraud'] + stats['ensemble_rows'] == len(df)
+    assert set(predictions['cascade_stage'].unique()).issubset({'screen', 'ensemble'})
+    
+    # Rows that reach the ensemble get the same scores as in full mode
+    fraud_model.cascade = False
+    full_predictions = fraud_model.predict(df)
+    in_band = (predictions['cascade_stage'] == 'ensemble').to_numpy()
+    assert np.allclose(predictions['ensemble_fraud_probability'].to_numpy()[in_band],
+                       full_predictions['ensemble_fraud_probability'].to_numpy()[in_band])
+    
+    # An upper bound below 1 lets the screen flag fraud without the ensemble
+    assert stats['screened_fraud'] == 0
+    fraud_model = FraudDetectionModel(cascade=True, cascade_band=(None, 0.6), recall_floor=0.9)
+    cascade = fraud_model.train(df, 'is_fraud')['cascade']
+    assert cascade['band'][1] == 0.6
+    assert cascade['holdout_recall'] >= min(0.9, cascade['ensemble_holdout_recall'])
+    fraud_model.predict(df)
+    assert fraud_model.cascade_stats['screened_fraud'] > 0
+    try:
+        FraudDetectionModel(cascade=True, cascade_band=(0.8, 0.6))
+        assert False, "Expected an invalid band to be rejected"
+    except ValueError:
+        pass
+    
+    print("Cascade scoring test passed!")
+    print(f"   - Band: {cascade['band']}")
+    print(f"   - Ensemble pass-through rate: {stats['ensemble_pass_through_rate']:.2%}")
+
+def test_reason_codes():
+    """Test that reason codes are only computed for risky rows and add up per model"""
+    print("\nTesting reason codes...")
+    
+    import json
+    import reason_codes
+    from reason_codes import ReasonCodes
+    
+    df = DataProcessor.generate_sample_data(1000)
+    fraud_model = FraudDetectionModel(reason_threshold=0.5, reason_top_k=2)
+    fraud_model.train(df, 'is_fraud')
+    predictions = fraud_model.predict(df)
+    
+    flagged = predictions['ensemble_fraud_probability'] > 0.5
+    assert (predictions.loc[~flagged, 'reason_codes'] == '').all()
+    for reasons in predictions.loc[flagged, 'reason_codes']:
+        reasons = json.loads(reasons)
+        assert 0 < len(reasons) <= 2
+        assert all(reason['contribution'] > 0 for reason in reasons)
+    
+    # Contributions add up to each model's deviation from its base rate
+    X, X_scaled = fraud_model.last_features
+    xgb_proba = fraud_model.xgb_model.predict_proba(X_scaled)[:, 1]
+    xgb_contribs = ReasonCodes.xgb_contributions(fraud_model.xgb_model, X_scaled)
+    spread = xgb_contribs.sum(axis=1) - xgb_proba
+    assert np.allclose(spread, spread[0], atol=1e-4)
+    
+    shap_module = reason_codes.shap
+    reason_codes.shap = None  # exercise the path-attribution fallback
+    try:
+        rf_proba = fraud_model.rf_model.predict_proba(X_scaled)[:, 1]
+        rf_contribs = ReasonCodes.rf_contributions(fraud_model.rf_model, X_scaled)
+        spread = rf_contribs.sum(axis=1) - rf_proba
+        assert np.allclose(spread, spread[0], atol=1e-6)
+    finally:
+        reason_codes.shap = shap_module
+    
+    print("Reason codes test passed!")
+    print(f"   - Explained {int(flagged.sum())} of {len(predictions)} rows")
+
+def test_champion_challenger():
+    """Test that challengers are scored on the champion's features without changing its decisions"""
+    print("\nTesting champion/challenger scoring...")
+    
+    import tempfile
+    
+    df = DataProcessor.generate_sample_data(1000)
+    champion = FraudDetectionModel(reason_threshold=None)
+    champion.train(df, 'is_fraud')
+    baseline = champion.predict(df)
+    
+    # A retrained model, saved and reloaded the way the API registers challengers
+    trained = FraudDetectionModel(reason_threshold=None)
+    trained.train(DataProcessor.generate_sample_data(1000), 'is_fraud')
+    with tempfile.TemporaryDirectory() as path:
+        trained.save(path)
+        challenger = FraudDetectionModel(reason_threshold=None)
+        challenger.load(path)
+    champion.challengers.add('retrained', challenger, champion)
+    
+    predictions = champion.predict(df)
+    assert predictions['is_fraud_predicted'].equals(baseline['is_fraud_predicted'])
+    assert np.allclose(predictions['ensemble_fraud_probability'], baseline['ensemble_fraud_probability'])
+    
+    # Shared features give the same scores as running the challenger on its own
+    own_scores = challenger.predict(df)['ensemble_fraud_probability'].to_numpy()
+    assert np.allclose(champion.challengers.last_scores['retrained'], own_scores)
+    
+    summary = champion.challengers.summary()['retrained']
+    disagreement = ((own_scores > 0.5).astype(int) != predictions['is_fraud_predicted'].to_numpy()).mean()
+    assert summary['rows'] == len(df)
+    assert abs(summary['disagreement_rate'] - disagreement) < 1e-4
+    assert summary['zero_filled_features'] == []
+    
+    # Features the champion wasn't trained on still reach the challenger
+    narrow_champion = FraudDetectionModel(reason_threshold=None)
+    narrow_champion.train(df.drop(columns=['merchant_id', 'customer_id']), 'is_fraud')
+    narrow_champion.challengers.add('retrained', challenger, narrow_champion)
+    narrow_champion.predict(df)
+    assert np.allclose(narrow_champion.challengers.last_scores['retrained'], own_scores)
+    assert narrow_champion.challengers.summary()['retrained']['zero_filled_features'] == []
+    
+    # Graph features can't be shared from a champion without a graph
+    graph_challenger = FraudDetectionModel(reason_threshold=None, graph_features=True)
+    graph_challenger.train(df, 'is_fraud')
+    try:
+        champion.challengers.add('graph', graph_challenger, champion)
+        assert False, "Challenger needing graph features should be refused"
+    except ValueError:
+        pass
+    
+    print("Champion/challenger test passed!")
+    print(f"   - Disagreement rate: {summary['disagreement_rate']:.2%}")
+
+def test_rethresholding():
+    """Test that stored runs can be re-decided without re-scoring"""
+    print("\nTesting re-thresholding of stored runs...")
+    
+    from decision_policy import DecisionPolicy
+    
+    df = DataProcessor.generate_sample_data(1000)
+    fraud_model = FraudDetectionModel(reason_threshold=None)
+    fraud_model.train(df, 'is_fraud')
+    predictions = fraud_model.predict(df)
+    scores = DecisionPolicy.extract_scores(predictions)
+    
+    # The default policy reproduces the stored decisions
+    decided = fraud_model.policy.evaluate(scores)
+    for col in ['is_fraud_predicted', 'risk_level', 'agreement_state']:
+        assert (decided[col].astype(str).to_numpy() == predictions[col].astype(str).to_numpy()).all()
+    assert DataProcessor.get_statistics(decided) == DataProcessor.get_statistics(predictions)
+    
+    # A new threshold and weights match a run scored with that policy
+    fraud_model.policy = DecisionPolicy(threshold=0.3, risk_bands=(0.2, 0.4, 0.6), weights=(3, 1))
+    rescored = fraud_model.predict(df)
+    decided = fraud_model.policy.evaluate(scores)
+    for col in ['is_fraud_predicted', 'risk_level', 'agreement_state']:
+        assert (decided[col].astype(str).to_numpy() == rescored[col].astype(str).to_numpy()).all()
+    
+    print("Re-thresholding test passed!")
+    print(f"   - Flagged at 0.5: {int(predictions['is_fraud_predicted'].sum())}, "
+          f"at 0.3: {int(decided['is_fraud_predicted'].sum())}")
+
+def test_warm_up():
+    """Test that a warm-up batch leaves monitoring state untouched"""
+    print("\nTesting model warm-up...")
+    
+    df = DataProcessor.generate_sample_data(1000)
+    fraud_model = FraudDetectionModel(graph_features=True)
+    fraud_model.train(df, 'is_fraud')
+    drift_before = fraud_model.drift_monitor.report()
+    graph_before = fraud_model.graph.summary()
+    
+    fraud_model.warm_up(DataProcessor.generate_sample_data(200))
+    assert fraud_model.drift_monitor.report() == drift_before
+    assert fraud_model.graph.summary() == graph_before
+    assert fraud_model.last_features is None
+    
+    predictions = fraud_model.predict(df)
+    assert fraud_model.drift_monitor.report()['rows'] == len(df)
+    assert len(predictions) == len(df)
+    
+    # A model saved without memory-budget mode loads cleanly into a budget-mode app
+    import tempfile
+    import warnings
+    with tempfile.TemporaryDirectory() as path:
+        fraud_model.save(path)
+        budget_model = FraudDetectionModel(memory_budget=True, graph_features=True)
+        budget_model.load(path)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        budget_model.warm_up(DataProcessor.generate_sample_data(200))
+        budget_model.predict(df)
+    assert not [w for w in caught if 'feature names' in str(w.message)]
+    
+    print("Warm-up test passed!")
+
 if __name__ == "__main__":
     try:
         # Test model training and prediction
         model, stats = test_model_training()
         
+        # Test memory-budget mode
+        test_memory_budget_mode()
+        
+        # Test cascade scoring
+        test_cascade_scoring()
+        
+        # Test reason codes
+        test_reason_codes()
+        
+        # Test champion/challenger scoring
+        test_champion_challenger()
+        
+        # Test re-thresholding of stored runs
+        test_rethresholding()
+        
+        # Test model warm-up
+        test_warm_up()
+        
         print("\nAll training tests passed successfully!")
         
     except Exception as e: